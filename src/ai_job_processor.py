@@ -1,12 +1,76 @@
 import json
 import logging
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
-from datetime import datetime
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from hashlib import blake2b
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+_UTC = timezone.utc
+
+# Keyword sets used by the simple text extractors
+TITLE_KEYWORDS = frozenset({'engineer', 'developer', 'manager', 'analyst', 'designer', 'director'})
+LOCATION_KEYWORDS = frozenset({'location:', 'based in', 'remote', 'san francisco', 'new york', 'london', 'berlin'})
+SALARY_KEYWORDS = frozenset({'salary', '$', 'compensation', 'pay', 'usd', 'eur', 'gbp'})
+
+def _keyword_pattern(keywords, whole_words: bool = False) -> re.Pattern:
+    """
+    Compile a case-insensitive alternation that matches any of the keywords,
+    as a substring or, with whole_words, only between word boundaries
+    """
+    alternatives = sorted(keywords, key=lambda keyword: (-len(keyword), keyword))
+    pattern = "|".join(re.escape(keyword) for keyword in alternatives)
+    if whole_words:
+        pattern = rf"\b(?:{pattern})\b"
+    return re.compile(pattern, re.IGNORECASE)
+
+# One multi-pattern scan per keyword set instead of a Python-level any() loop.
+# Role keywords must be whole words so e.g. "managerial" isn't taken for a title;
+# location and salary indicators include punctuation ("location:", "$") and
+# stay substring matches.
+TITLE_PATTERN = _keyword_pattern(TITLE_KEYWORDS, whole_words=True)
+LOCATION_PATTERN = _keyword_pattern(LOCATION_KEYWORDS)
+SALARY_PATTERN = _keyword_pattern(SALARY_KEYWORDS)
+COMPANY_HINT_PATTERN = re.compile(r"at ", re.IGNORECASE)
+
+# Maximum number of words kept for the job description summary
+SUMMARY_WORD_LIMIT = 500
+
+# Number of distinct postings whose extraction results are memoized
+EXTRACTION_CACHE_SIZE = 1024
+
+# Confidence contributed by each extracted field, in tenths; the score is
+# computed once from the tally so it is exact (e.g. 0.6, not 0.6000000000000001)
+CONFIDENCE_WEIGHTS = {
+    'title': 2,
+    'company': 2,
+    'location': 1,
+    'salary': 1,
+    'responsibilities': 2,
+    'requirements': 2,
+}
+
+WORD_PATTERN = re.compile(r"\S+")
+
+# Classifies a stripped line in one pass: responsibilities header, requirements
+# header, markdown heading or list item. Header keywords take precedence, so
+# they are checked with lookaheads before the anchored alternatives.
+SECTION_PATTERN = re.compile(
+    r"^(?:"
+    r"(?=.*?(?:responsibilities|duties|what you))(?P<responsibilities>)"
+    r"|(?=.*?(?:requirements|qualifications|must have))(?P<requirements>)"
+    r"|(?P<heading>\#)"
+    r"|[-*]\s*(?P<item>.*)"
+    r")",
+    re.IGNORECASE
+)
+
+@dataclass(slots=True)
 class ProcessedJobData:
     """Structured job data extracted by AI from raw content"""
     # Core job information
@@ -17,10 +81,10 @@ class ProcessedJobData:
     
     # Job details
     job_description: str = ""
-    responsibilities: List[str] = None
-    requirements: List[str] = None
-    preferred_qualifications: List[str] = None
-    benefits: List[str] = None
+    responsibilities: List[str] = field(default_factory=list)
+    requirements: List[str] = field(default_factory=list)
+    preferred_qualifications: List[str] = field(default_factory=list)
+    benefits: List[str] = field(default_factory=list)
     
     # Compensation
     salary_min: Optional[int] = None
@@ -38,23 +102,21 @@ class ProcessedJobData:
     application_instructions: str = ""
     
     # Metadata
-    processed_at: datetime = None
+    processed_at: datetime = field(default_factory=lambda: datetime.now(_UTC))
     confidence_score: float = 0.0
-    extraction_notes: List[str] = None
+    extraction_notes: List[str] = field(default_factory=list)
     
-    def __post_init__(self):
-        if self.responsibilities is None:
-            self.responsibilities = []
-        if self.requirements is None:
-            self.requirements = []
-        if self.preferred_qualifications is None:
-            self.preferred_qualifications = []
-        if self.benefits is None:
-            self.benefits = []
-        if self.extraction_notes is None:
-            self.extraction_notes = []
-        if self.processed_at is None:
-            self.processed_at = datetime.utcnow()
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Equivalent of dataclasses.asdict for this flat record. Every field is a
+        scalar or a list of strings, so a shallow copy avoids asdict's
+        recursive deepcopy walk.
+        """
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            data[name] = list(value) if isinstance(value, list) else value
+        return data
 
 class AIJobProcessor:
     """
@@ -72,9 +134,38 @@ class AIJobProcessor:
         """
         Extract structured job data from raw markdown content.
         In production, this would use an AI model (OpenAI, Claude, etc.)
+        
+        Results are memoized on a BLAKE2b digest of the content, so repeated
+        calls with the same markdown skip the scan. Each call gets its own
+        copy stamped with the current processing time.
         """
         logger.info(f"Processing job content ({len(raw_markdown)} chars)")
         
+        cached = _extract_cached(raw_markdown)
+        
+        # Copy the list fields so callers can annotate results without
+        # mutating the cached instance
+        return replace(
+            cached,
+            responsibilities=list(cached.responsibilities),
+            requirements=list(cached.requirements),
+            preferred_qualifications=list(cached.preferred_qualifications),
+            benefits=list(cached.benefits),
+            extraction_notes=list(cached.extraction_notes),
+            processed_at=datetime.now(_UTC),
+        )
+    
+    def extract_batch(self, items: List[Tuple[str, str]]) -> List[ProcessedJobData]:
+        """
+        Extract structured job data for many (raw_markdown, url) pairs, in input order.
+        Runs in-process: forking a worker pool from the threaded server risks
+        deadlocks, and repeated postings are served from the extraction cache.
+        """
+        return [self.extract_job_data(raw_markdown, url) for raw_markdown, url in items]
+    
+    @staticmethod
+    def _extract_impl(raw_markdown: str) -> ProcessedJobData:
+        """Run the extraction itself; pure function of the markdown content"""
         # This is a simplified demonstration - in production you'd use:
         # - OpenAI GPT-4 with structured outputs
         # - Claude with function calling
@@ -86,118 +177,112 @@ class AIJobProcessor:
         # Simple text extraction (replace with AI model)
         processed_data.extraction_notes.append("Using simple text processing (demo)")
         
-        # Extract title from common patterns
-        title = self._extract_title(raw_markdown)
-        if title:
-            processed_data.job_title = title
-            processed_data.confidence_score += 0.2
-        
-        # Extract company from common patterns
-        company = self._extract_company(raw_markdown)
-        if company:
-            processed_data.company_name = company
-            processed_data.confidence_score += 0.2
-        
-        # Extract location
-        location = self._extract_location(raw_markdown)
-        if location:
-            processed_data.location = location
-            processed_data.confidence_score += 0.1
+        # Extract title, company, location, salary and sections in one pass
+        scan = AIJobProcessor._scan(raw_markdown)
         
-        # Extract salary information
-        salary_info = self._extract_salary(raw_markdown)
-        if salary_info:
-            processed_data.salary_text = salary_info
-            processed_data.confidence_score += 0.1
+        # Title, company, location and salary from common patterns
+        processed_data.job_title = scan['title']
+        processed_data.company_name = scan['company']
+        processed_data.location = scan['location']
+        processed_data.salary_text = scan['salary']
         
-        # Store raw description (first 500 words as summary)
-        words = raw_markdown.split()[:500]
-        processed_data.job_description = " ".join(words)
+        # Store raw description (first 500 words as summary); only the kept
+        # words are materialized rather than tokenizing the whole document
+        words = (match.group() for match in WORD_PATTERN.finditer(raw_markdown))
+        processed_data.job_description = " ".join(islice(words, SUMMARY_WORD_LIMIT))
         
         # Extract sections
-        sections = self._extract_sections(raw_markdown)
-        if sections.get('responsibilities'):
-            processed_data.responsibilities = sections['responsibilities']
-            processed_data.confidence_score += 0.2
-        if sections.get('requirements'):
-            processed_data.requirements = sections['requirements']
-            processed_data.confidence_score += 0.2
+        processed_data.responsibilities = scan['responsibilities']
+        processed_data.requirements = scan['requirements']
+        
+        # Score every field that was found in one step
+        tenths = sum(weight for name, weight in CONFIDENCE_WEIGHTS.items() if scan[name])
+        processed_data.confidence_score = tenths / 10
         
         logger.info(f"Extracted data with confidence: {processed_data.confidence_score:.2f}")
         return processed_data
     
-    def _extract_title(self, text: str) -> str:
-        """Extract job title using simple pattern matching"""
-        lines = text.split('\n')
-        for line in lines[:10]:  # Check first 10 lines
-            line = line.strip()
-            if len(line) > 10 and len(line) < 100:
-                # Look for title patterns
-                if any(word in line.lower() for word in ['engineer', 'developer', 'manager', 'analyst', 'designer', 'director']):
-                    return line.replace('#', '').strip()
-        return ""
-    
-    def _extract_company(self, text: str) -> str:
-        """Extract company name using simple pattern matching"""
-        # Look for "at [Company]" or "Company Name" patterns
-        lines = text.split('\n')
-        for line in lines[:20]:
-            if 'at ' in line.lower() and len(line) < 100:
-                parts = line.split(' at ')
-                if len(parts) > 1:
-                    return parts[-1].strip()
-        return ""
-    
-    def _extract_location(self, text: str) -> str:
-        """Extract location information"""
-        location_indicators = ['location:', 'based in', 'remote', 'san francisco', 'new york', 'london', 'berlin']
-        lines = text.split('\n')
-        for line in lines[:30]:
-            line_lower = line.lower()
-            if any(indicator in line_lower for indicator in location_indicators):
-                return line.strip()
-        return ""
-    
-    def _extract_salary(self, text: str) -> str:
-        """Extract salary information"""
-        salary_indicators = ['salary', '$', 'compensation', 'pay', 'usd', 'eur', 'gbp']
-        lines = text.split('\n')
-        for line in lines:
-            line_lower = line.lower()
-            if any(indicator in line_lower for indicator in salary_indicators):
-                if any(char.isdigit() for char in line):
-                    return line.strip()
-        return ""
-    
-    def _extract_sections(self, text: str) -> Dict[str, List[str]]:
-        """Extract different sections from the job posting"""
+    @staticmethod
+    def _scan(text: str) -> Dict[str, Any]:
+        """
+        Extract title, company, location, salary and the responsibilities /
+        requirements sections in a single pass over the lines of the posting.
+        Title, company and location are only looked for in the first 10, 20
+        and 30 lines respectively; the first match for each field wins.
+        """
+        title = company = location = salary = None
         sections = {'responsibilities': [], 'requirements': []}
-        
-        lines = text.split('\n')
         current_section = None
         
-        for line in lines:
-            line = line.strip()
-            if not line:
+        for index, line in enumerate(text.split('\n')):
+            stripped = line.strip()
+            if not stripped:
                 continue
+            
+            # Keyword patterns are case-insensitive, so no lowercase copy is needed
+            if index < 30 or salary is None:
+                # Title: short line in the first 10 containing a role keyword
+                if title is None and index < 10 and 10 < len(stripped) < 100:
+                    if TITLE_PATTERN.search(stripped):
+                        title = stripped.replace('#', '').strip()
                 
-            # Detect section headers
-            line_lower = line.lower()
-            if any(word in line_lower for word in ['responsibilities', 'duties', 'what you']):
-                current_section = 'responsibilities'
-                continue
-            elif any(word in line_lower for word in ['requirements', 'qualifications', 'must have']):
-                current_section = 'requirements'
-                continue
-            elif line.startswith('#') or len(line) < 10:
-                current_section = None
-                continue
+                # Company: "... at [Company]" in the first 20 lines
+                if company is None and index < 20 and len(line) < 100 and COMPANY_HINT_PATTERN.search(stripped):
+                    parts = line.split(' at ')
+                    if len(parts) > 1:
+                        company = parts[-1].strip()
+                
+                # Location indicators in the first 30 lines
+                if location is None and index < 30 and LOCATION_PATTERN.search(stripped):
+                    location = stripped
+                
+                # Salary: any line with a salary indicator and a digit
+                if salary is None and SALARY_PATTERN.search(stripped):
+                    if any(char.isdigit() for char in stripped):
+                        salary = stripped
             
-            # Add to current section
-            if current_section and line.startswith('-') or line.startswith('*'):
-                sections[current_section].append(line[1:].strip())
+            # Section headers and list items
+            match = SECTION_PATTERN.match(stripped)
+            kind = match.lastgroup if match else None
+            
+            if kind == 'responsibilities' or kind == 'requirements':
+                current_section = kind
+            elif kind == 'heading' or len(stripped) < 10:
+                current_section = None
+            elif kind == 'item' and current_section:
+                sections[current_section].append(match.group('item'))
         
-        return sections
+        return {
+            'title': title or "",
+            'company': company or "",
+            'location': location or "",
+            'salary': salary or "",
+            'responsibilities': sections['responsibilities'],
+            'requirements': sections['requirements'],
+        }
+
+# LRU of extraction results keyed on the content digest; only the
+# 16-byte digest is held, never the page text itself
+_extraction_cache = OrderedDict()
+_extraction_cache_lock = threading.Lock()
+
+def _extract_cached(raw_markdown: str) -> ProcessedJobData:
+    """Memoized extraction keyed on the content digest"""
+    # surrogatepass so scraped text with lone surrogates still hashes
+    digest = blake2b(raw_markdown.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+    with _extraction_cache_lock:
+        cached = _extraction_cache.get(digest)
+        if cached is not None:
+            _extraction_cache.move_to_end(digest)
+            return cached
+    
+    result = AIJobProcessor._extract_impl(raw_markdown)
+    with _extraction_cache_lock:
+        _extraction_cache[digest] = result
+        _extraction_cache.move_to_end(digest)
+        while len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+    return result
 
 # Example of how this would work with the flexible scraper
 def demo_ai_processing():
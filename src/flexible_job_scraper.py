@@ -1,17 +1,197 @@
 import os
+import asyncio
 import logging
+import random
 import time
 import re
-from datetime import datetime
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
-from firecrawl import FirecrawlApp
+import copy
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from dataclasses import dataclass, field
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from firecrawl import AsyncFirecrawlApp, FirecrawlApp
+
+from scrape_cache import ScrapeCache
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# URLs submitted per Firecrawl batch scrape job
+BATCH_SIZE = 50
+
+# Firecrawl plan limits: concurrent requests and requests per minute
+MAX_CONCURRENT_SCRAPES = 5
+REQUESTS_PER_MINUTE = 100
+
+# Retries for transient single-URL scrape failures, with jittered exponential
+# backoff starting at SCRAPE_RETRY_DELAY seconds
+SCRAPE_RETRIES = 2
+SCRAPE_RETRY_DELAY = 1.0
+SCRAPE_RETRY_MAX_DELAY = 10.0
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def _literal_chain(pattern: str) -> List[re.Pattern]:
+    """Split an "a.*b.*c" pattern into case-insensitive literal patterns"""
+    return [re.compile(re.escape(literal), re.IGNORECASE) for literal in pattern.split(".*")]
+
+def _contains_in_order(content: str, literals: List[re.Pattern], span_lines: bool = False) -> bool:
+    """
+    Equivalent to searching content for the "a.*b.*c" pattern the literals came
+    from (with re.DOTALL when span_lines is set). Each literal's earliest
+    occurrence after the previous one is found in a forward scan, instead of
+    letting .* backtrack from every candidate start, which is quadratic on long
+    pages that contain the first literal but not the rest.
+    """
+    first, rest = literals[0], literals[1:]
+    start = 0
+    while True:
+        match = first.search(content, start)
+        if match is None:
+            return False
+        
+        # Without span_lines the whole chain must sit on the first literal's line
+        end = len(content)
+        if not span_lines:
+            newline = content.find("\n", match.end())
+            if newline != -1:
+                end = newline
+        
+        position = match.end()
+        for literal in rest:
+            match = literal.search(content, position, end)
+            if match is None:
+                break
+            position = match.end()
+        else:
+            return True
+        
+        # The earliest start on a line is the best one, so move on to the next line
+        if end == len(content):
+            return False
+        start = end + 1
+
+# Content patterns used by validate_content_quality, as (pattern, literal chain)
+# pairs compiled once at import; 404 patterns may span lines
+ERROR_404_PATTERNS = [
+    (pattern, _literal_chain(pattern)) for pattern in (
+        r"404.*error",
+        r"page.*not.*found",
+        r"sorry.*couldn't.*find",
+        r"job.*posting.*might.*have.*closed",
+        r"job.*posting.*removed",
+        r"not found.*404",
+        r"the.*job.*you're.*looking.*for.*might.*have.*closed"
+    )
+]
+
+ERROR_PATTERNS = [
+    (pattern, _literal_chain(pattern)) for pattern in (
+        r"access.*denied",
+        r"unauthorized",
+        r"forbidden",
+        r"server.*error",
+        r"temporarily.*unavailable",
+        r"maintenance.*mode"
+    )
+]
+
+JOB_INDICATOR_PATTERNS = [
+    _literal_chain(pattern) for pattern in (
+        r"responsibilities",
+        r"requirements",
+        r"qualifications",
+        r"experience",
+        r"skills",
+        r"job.*description",
+        r"role.*description",
+        r"position.*description",
+        r"what.*you.*will.*do",
+        r"what.*we.*offer",
+        r"benefits",
+        r"salary",
+        r"apply.*now",
+        r"submit.*application"
+    )
+]
+
+NON_SPACE_PATTERN = re.compile(r"\S")
+
+def _stripped_length_at_least(content: str, length: int) -> bool:
+    """len(content.strip()) >= length, without allocating the stripped copy"""
+    first = NON_SPACE_PATTERN.search(content)
+    return first is not None and NON_SPACE_PATTERN.search(content, first.start() + length - 1) is not None
+
+# Page titles containing any of these are treated as 404 pages
+TITLE_404_INDICATORS = ("404", "not found", "error")
+
+# ATS platforms keyed by a named group per domain; the matching group name is the platform
+ATS_PLATFORM_PATTERN = re.compile(
+    r"(?P<greenhouse>greenhouse\.io)"
+    r"|(?P<lever>lever\.co)"
+    r"|(?P<ashby>ashbyhq\.com)"
+    r"|(?P<workday>workday\.com)"
+    r"|(?P<successfactors>successfactors\.com)"
+    r"|(?P<icims>icims\.com)"
+    r"|(?P<bamboohr>bamboohr\.com)"
+)
+
+def _is_transient(error: requests.exceptions.RequestException) -> bool:
+    """Whether a failed Firecrawl request is worth retrying"""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code in RETRYABLE_STATUSES
+
+def _normalize_url(url: str) -> str:
+    """
+    Canonical form used to match batch documents back to requested URLs:
+    Firecrawl may report the URL with a different case, trailing slash,
+    default port or without the fragment.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and (scheme, parts.port) not in (('http', 80), ('https', 443)):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path.rstrip('/'), parts.query, ''))
+
+@lru_cache(maxsize=4096)
+def _detect_ats_platform(url: str) -> str:
+    """Return the ATS platform name for a URL, or 'unknown'"""
+    match = ATS_PLATFORM_PATTERN.search(url)
+    return match.lastgroup if match else "unknown"
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter allowing max_calls per period seconds"""
+    
+    def __init__(self, max_calls: int, period: float = 60.0):
+        self.max_calls = max_calls
+        self.period = period
+        self.calls = deque()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until another call fits in the window, then record it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0] >= self.period:
+                    self.calls.popleft()
+                if len(self.calls) < self.max_calls:
+                    self.calls.append(now)
+                    return
+                delay = self.period - (now - self.calls[0])
+            time.sleep(delay)
+
+@dataclass(slots=True)
 class RawJobData:
     """Data class for raw scraped job information"""
     url: str
@@ -19,16 +199,67 @@ class RawJobData:
     title: Optional[str] = None
     raw_markdown: str = ""
     raw_html: str = ""
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
     ats_platform: Optional[str] = None
     success: bool = False
     error_message: Optional[str] = None
     content_quality: str = "unknown"  # good, poor, invalid, 404
     quality_reason: Optional[str] = None
 
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form matching dataclasses.asdict, built without reflection"""
+        return {
+            'url': self.url,
+            'scraped_at': self.scraped_at,
+            'title': self.title,
+            'raw_markdown': self.raw_markdown,
+            'raw_html': self.raw_html,
+            'metadata': copy.deepcopy(self.metadata),
+            'ats_platform': self.ats_platform,
+            'success': self.success,
+            'error_message': self.error_message,
+            'content_quality': self.content_quality,
+            'quality_reason': self.quality_reason,
+        }
+
+class PooledFirecrawlApp(FirecrawlApp):
+    """
+    FirecrawlApp whose shared request helpers go through one pooled keep-alive
+    session instead of module-level requests calls, so batch submission and
+    status polling reuse TCP+TLS connections. The SDK's scrape_url posts with
+    requests directly and is unaffected.
+    """
+    
+    def __init__(self, *args, pool_size: int = MAX_CONCURRENT_SCRAPES, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset({"GET", "POST", "DELETE"}),
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Connection": "keep-alive"})
+    
+    def _post_request(self, url: str, data: Dict[str, Any], headers: Dict[str, str],
+                      retries: int = 3, backoff_factor: float = 0.5) -> requests.Response:
+        timeout = (data["timeout"] + 5000) if "timeout" in data else None
+        return self.session.post(url, headers=headers, json=data, timeout=timeout)
+    
+    def _get_request(self, url: str, headers: Dict[str, str],
+                     retries: int = 3, backoff_factor: float = 0.5) -> requests.Response:
+        return self.session.get(url, headers=headers)
+    
+    def _delete_request(self, url: str, headers: Dict[str, str],
+                        retries: int = 3, backoff_factor: float = 0.5) -> requests.Response:
+        return self.session.delete(url, headers=headers)
 
 class FlexibleJobScraper:
     """
@@ -37,95 +268,66 @@ class FlexibleJobScraper:
     then use AI models to extract structured information.
     """
     
-    def __init__(self, firecrawl_api_key: str):
-        self.app = FirecrawlApp(api_key=firecrawl_api_key)
+    def __init__(self, firecrawl_api_key: str, requests_per_minute: int = REQUESTS_PER_MINUTE,
+                 include_html: bool = False):
+        self.app = PooledFirecrawlApp(api_key=firecrawl_api_key)
+        self.async_app = AsyncFirecrawlApp(api_key=firecrawl_api_key)
+        
+        # Markdown of the main content is all the AI step reads; HTML makes
+        # each scrape slower and costs more, so it is opt-in
+        self.scrape_options = {
+            'formats': ['markdown', 'html'] if include_html else ['markdown'],
+            'only_main_content': True,
+        }
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.cache = ScrapeCache()
+    
+    def close(self):
+        """Close the pooled Firecrawl HTTP session"""
+        self.app.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
         
     def detect_ats_platform(self, url: str) -> str:
-        """Detect the ATS platform from URL"""
-        if "greenhouse.io" in url:
-            return "greenhouse"
-        elif "lever.co" in url:
-            return "lever"
-        elif "ashbyhq.com" in url:
-            return "ashby"
-        elif "workday.com" in url:
-            return "workday"
-        elif "successfactors.com" in url:
-            return "successfactors"
-        elif "icims.com" in url:
-            return "icims"
-        elif "bamboohr.com" in url:
-            return "bamboohr"
-        return "unknown"
-    
-    def validate_content_quality(self, content: str, title: str, metadata: Dict[str, Any]) -> tuple[str, str]:
+        """Detect the ATS platform from URL (one regex pass, memoized per URL)"""
+        return _detect_ats_platform(url)
+    
+    @staticmethod
+    def validate_content_quality(content: str, title: str, metadata: Dict[str, Any]) -> tuple[str, str]:
         """
         Validate content quality and detect common issues early.
         Returns (quality_level, reason)
         """
-        if not content or len(content.strip()) < 50:
+        if not content or not _stripped_length_at_least(content, 50):
             return "invalid", "Content too short (less than 50 characters)"
         
-        # Check for 404 errors
-        error_404_patterns = [
-            r"404.*error",
-            r"page.*not.*found",
-            r"sorry.*couldn't.*find",
-            r"job.*posting.*might.*have.*closed",
-            r"job.*posting.*removed",
-            r"not found.*404",
-            r"the.*job.*you're.*looking.*for.*might.*have.*closed"
-        ]
-        
-        content_lower = content.lower()
-        title_lower = title.lower() if title else ""
-        
-        for pattern in error_404_patterns:
-            if re.search(pattern, content_lower, re.IGNORECASE | re.DOTALL):
-                return "404", f"Detected 404 error pattern: {pattern}"
+        # A 404 status code is definitive, so check it before any pattern work
+        if metadata.get('statusCode') == 404:
+            return "404", "HTTP 404 status code returned"
         
         # Check title for 404 indicators
-        if any(indicator in title_lower for indicator in ["404", "not found", "error"]):
+        if title and any(map(title.lower().__contains__, TITLE_404_INDICATORS)):
             return "404", f"404 detected in title: {title}"
         
-        # Check HTTP status code from metadata
-        if metadata.get('statusCode') == 404:
-            return "404", "HTTP 404 status code returned"
+        # Soft 404s: an OK status with a "not found" body. All content patterns
+        # are case-insensitive, so the body is searched as-is rather than
+        # through a full-size lowercase copy
+        for pattern, literals in ERROR_404_PATTERNS:
+            if _contains_in_order(content, literals, span_lines=True):
+                return "404", f"Detected 404 error pattern: {pattern}"
         
         # Check for other error pages
-        error_patterns = [
-            r"access.*denied",
-            r"unauthorized",
-            r"forbidden",
-            r"server.*error",
-            r"temporarily.*unavailable",
-            r"maintenance.*mode"
-        ]
-        
-        for pattern in error_patterns:
-            if re.search(pattern, content_lower, re.IGNORECASE):
+        for pattern, literals in ERROR_PATTERNS:
+            if _contains_in_order(content, literals):
                 return "invalid", f"Detected error pattern: {pattern}"
         
         # Check for minimum job posting indicators
-        job_indicators = [
-            r"responsibilities",
-            r"requirements",
-            r"qualifications",
-            r"experience",
-            r"skills",
-            r"job.*description",
-            r"role.*description",
-            r"position.*description",
-            r"what.*you.*will.*do",
-            r"what.*we.*offer",
-            r"benefits",
-            r"salary",
-            r"apply.*now",
-            r"submit.*application"
-        ]
-        
-        indicator_count = sum(1 for pattern in job_indicators 
-                             if re.search(pattern, content_lower, re.IGNORECASE))
+        indicator_count = sum(1 for literals in JOB_INDICATOR_PATTERNS 
+                              if _contains_in_order(content, literals))
         
         if indicator_count == 0:
             return "poor", "No job posting indicators found"
@@ -136,78 +338,254 @@ class FlexibleJobScraper:
         else:
             return "good", f"Found {indicator_count} job indicators, good content length"
     
-    def scrape_job_raw(self, url: str) -> RawJobData:
+    def scrape_job_raw(self, url: str, wait_for: Optional[int] = None) -> RawJobData:
         """
         Scrape job posting and return raw content for AI processing.
         This is the flexible approach you originally planned.
+        
+        Pass wait_for (milliseconds) for JavaScript-rendered pages that need
+        time to load before their content is captured.
         """
-        logger.info(f"Scraping raw job data from: {url}")
+        cached = self.cache.get(url)
+        if cached is not None:
+            logger.info("Using cached raw job data for: %s", url)
+            return cached
+        
+        logger.info("Scraping raw job data from: %s", url)
         
         job_data = RawJobData(
             url=url,
-            scraped_at=datetime.utcnow(),
+            scraped_at=datetime.now(timezone.utc),
             ats_platform=self.detect_ats_platform(url)
         )
         
         try:
-            # Scrape with Firecrawl - get both markdown and HTML
-            result = self.app.scrape_url(url)
+            # Scrape with Firecrawl - markdown, plus HTML when enabled
+            options = dict(self.scrape_options)
+            if wait_for:
+                options['wait_for'] = wait_for
+            result = self._scrape_with_retry(url, options)
+            return self._fill_raw_job_data(job_data, result)
             
-            # Extract raw content
-            job_data.raw_markdown = result.markdown or ""
-            job_data.raw_html = result.html or ""
-            job_data.title = result.metadata.get('title', '') if result.metadata else ""
-            job_data.metadata = result.metadata or {}
-            job_data.success = True
+        except Exception as e:
+            return self._mark_failed(job_data, e)
+    
+    def _scrape_with_retry(self, url: str, options: Dict[str, Any]):
+        """
+        Scrape one URL with Firecrawl, retrying connection errors, timeouts and
+        429/5xx responses. The SDK's scrape_url does not retry on its own (the
+        async client and batch calls already do).
+        """
+        for attempt in range(SCRAPE_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                return self.app.scrape_url(url, **options)
+            except requests.exceptions.RequestException as e:
+                if attempt == SCRAPE_RETRIES or not _is_transient(e):
+                    raise
+                # Equal jitter keeps concurrent retries from landing together
+                backoff = min(SCRAPE_RETRY_MAX_DELAY, SCRAPE_RETRY_DELAY * 2 ** attempt)
+                delay = backoff / 2 + random.uniform(0, backoff / 2)
+                logger.warning("Transient Firecrawl error for %s (attempt %s/%s), retrying in %.1fs: %s",
+                               url, attempt + 1, SCRAPE_RETRIES + 1, delay, e)
+                time.sleep(delay)
+    
+    async def scrape_job_raw_async(self, url: str, wait_for: Optional[int] = None) -> RawJobData:
+        """Async variant of scrape_job_raw using Firecrawl's async client"""
+        cached = self.cache.get(url)
+        if cached is not None:
+            logger.info("Using cached raw job data for: %s", url)
+            return cached
+        
+        logger.info("Scraping raw job data from: %s", url)
+        
+        job_data = RawJobData(
+            url=url,
+            scraped_at=datetime.now(timezone.utc),
+            ats_platform=self.detect_ats_platform(url)
+        )
+        
+        try:
+            options = dict(self.scrape_options)
+            if wait_for:
+                options['wait_for'] = wait_for
+            # The limiter blocks, so wait for it off the event loop
+            await asyncio.to_thread(self.rate_limiter.acquire)
+            result = await self.async_app.scrape_url(url, **options)
+            return self._fill_raw_job_data(job_data, result)
             
-            # Validate content quality early
-            quality, reason = self.validate_content_quality(
+        except Exception as e:
+            return self._mark_failed(job_data, e)
+    
+    def _mark_failed(self, job_data: RawJobData, error: Exception) -> RawJobData:
+        """Record a scraping failure on job_data"""
+        error_msg = f"Error scraping {job_data.url}: {str(error)}"
+        logger.error(error_msg)
+        job_data.error_message = error_msg
+        job_data.success = False
+        job_data.content_quality = "invalid"
+        job_data.quality_reason = f"Scraping failed: {str(error)}"
+        return job_data
+    
+    def _fill_raw_job_data(self, job_data: RawJobData, result,
+                           quality: Optional[Tuple[str, str]] = None) -> RawJobData:
+        """
+        Copy a Firecrawl document into job_data and assess its content quality,
+        unless an already computed (quality, reason) pair is passed in
+        """
+        url = job_data.url
+        
+        # Extract raw content
+        metadata = result.metadata or {}
+        job_data.raw_markdown = result.markdown or ""
+        job_data.raw_html = result.html or ""
+        job_data.title = metadata.get('title', '')
+        job_data.metadata = metadata
+        job_data.success = True
+        
+        # Validate content quality early
+        if quality is None:
+            quality = self.validate_content_quality(
                 job_data.raw_markdown, 
                 job_data.title, 
                 job_data.metadata
             )
-            job_data.content_quality = quality
-            job_data.quality_reason = reason
-            
-            # Log quality assessment
-            if quality == "404":
-                logger.warning(f"404 error detected for {url}: {reason}")
-            elif quality == "invalid":
-                logger.warning(f"Invalid content detected for {url}: {reason}")
-            elif quality == "poor":
-                logger.warning(f"Poor quality content for {url}: {reason}")
+        quality, reason = quality
+        job_data.content_quality = quality
+        job_data.quality_reason = reason
+        
+        # Log quality assessment
+        if quality == "404":
+            logger.warning("404 error detected for %s: %s", url, reason)
+        elif quality == "invalid":
+            logger.warning("Invalid content detected for %s: %s", url, reason)
+        elif quality == "poor":
+            logger.warning("Poor quality content for %s: %s", url, reason)
+        else:
+            logger.info("Good quality content for %s: %s", url, reason)
+        
+        logger.info("Successfully scraped %s chars of content (quality: %s)", len(job_data.raw_markdown), quality)
+        self.cache.put(url, job_data)
+        return job_data
+    
+    def _assess_documents(self, documents: List[Any]) -> List[Tuple[str, str]]:
+        """
+        Assess the content quality of Firecrawl documents. The checks are a few
+        precompiled scans per page, so they run inline; forking a process pool
+        from a threaded server would cost more and risks deadlocking on locks
+        held by other threads at fork time.
+        """
+        qualities = []
+        for document in documents:
+            metadata = document.metadata or {}
+            qualities.append(self.validate_content_quality(document.markdown or "", metadata.get('title', ''), metadata))
+        return qualities
+    
+    def scrape_jobs_batch(self, urls: List[str], batch_size: int = BATCH_SIZE,
+                          max_workers: int = MAX_CONCURRENT_SCRAPES) -> List[RawJobData]:
+        """
+        Scrape job postings through Firecrawl's batch endpoint, batch_size URLs
+        per job, so Firecrawl scrapes them concurrently instead of one request
+        per URL. Results are returned in input order; URLs missing from a batch
+        response (or whose batch failed) fall back to scrape_job_raw, run on up
+        to max_workers threads. Cached URLs are not scraped again.
+        """
+        results = {}
+        pending = []
+        for url in dict.fromkeys(urls):
+            cached = self.cache.get(url)
+            if cached is not None:
+                results[url] = cached
             else:
-                logger.info(f"Good quality content for {url}: {reason}")
+                pending.append(url)
+        
+        if results:
+            logger.info("Serving %s jobs from cache", len(results))
+        
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            logger.info("Batch scraping jobs %s-%s/%s", start + 1, start + len(chunk), len(pending))
             
-            logger.info(f"Successfully scraped {len(job_data.raw_markdown)} chars of content (quality: {quality})")
-            return job_data
+            try:
+                self.rate_limiter.acquire()
+                response = self.app.batch_scrape_urls(chunk, **self.scrape_options)
+                documents = response.data or []
+            except Exception as e:
+                logger.error("Batch scrape failed, falling back to single scrapes: %s", e)
+                documents = []
             
-        except Exception as e:
-            error_msg = f"Error scraping {url}: {str(e)}"
-            logger.error(error_msg)
-            job_data.error_message = error_msg
-            job_data.success = False
-            job_data.content_quality = "invalid"
-            job_data.quality_reason = f"Scraping failed: {str(e)}"
-            return job_data
-    
-    def scrape_multiple_jobs_raw(self, urls: List[str]) -> List[RawJobData]:
-        """Scrape multiple job postings with rate limiting"""
-        results = []
-        
-        for i, url in enumerate(urls):
-            logger.info(f"Scraping job {i+1}/{len(urls)}: {url}")
+            # Batch results are not guaranteed to be in submission order, and
+            # the reported URL may be normalized or the post-redirect one
+            by_normalized = {}
+            for document in documents:
+                metadata = document.metadata or {}
+                for key in {_normalize_url(u) for u in (metadata.get('sourceURL'), metadata.get('url')) if u}:
+                    by_normalized.setdefault(key, document)
+            
+            by_url = {}
+            for url in chunk:
+                document = by_normalized.get(_normalize_url(url))
+                if document is not None:
+                    by_url[url] = document
+            
+            missing = [url for url in chunk if url not in by_url]
+            matched_ids = {id(document) for document in by_url.values()}
+            unmatched = [document for document in documents if id(document) not in matched_ids]
+            # A single leftover document can only belong to the single leftover URL
+            if len(missing) == 1 and len(unmatched) == 1:
+                by_url[missing.pop()] = unmatched[0]
             
-            result = self.scrape_job_raw(url)
-            results.append(result)
+            # Scrape anything the batch did not return concurrently
+            fallback = {}
+            if missing:
+                for url in missing:
+                    logger.warning("No batch result for %s, re-scraping it individually", url)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    fallback = dict(zip(missing, executor.map(self.scrape_job_raw, missing)))
             
-            # Rate limiting - wait between requests
-            if i < len(urls) - 1:
-                time.sleep(2)  # 2 second delay between requests
+            returned = [url for url in chunk if url in by_url]
+            qualities = dict(zip(returned, self._assess_documents([by_url[url] for url in returned])))
+            
+            for url in chunk:
+                if url in fallback:
+                    results[url] = fallback[url]
+                    continue
+                
+                job_data = RawJobData(
+                    url=url,
+                    scraped_at=datetime.now(timezone.utc),
+                    ats_platform=self.detect_ats_platform(url)
+                )
+                results[url] = self._fill_raw_job_data(job_data, by_url[url], qualities[url])
+        
+        return [results[url] for url in urls]
+    
+    async def scrape_multiple_jobs_raw_async(self, urls: List[str],
+                                             max_concurrency: int = MAX_CONCURRENT_SCRAPES) -> List[RawJobData]:
+        """
+        Scrape job postings concurrently on one event loop, with at most
+        max_concurrency requests in flight. Results are returned in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def scrape_one(url: str) -> RawJobData:
+            async with semaphore:
+                return await self.scrape_job_raw_async(url)
+        
+        return list(await asyncio.gather(*(scrape_one(url) for url in urls)))
+    
+    def scrape_multiple_jobs_raw(self, urls: List[str]) -> List[RawJobData]:
+        """Scrape multiple job postings using Firecrawl batch scraping"""
+        results = self.scrape_jobs_batch(urls)
         
-        successful = sum(1 for r in results if r.success)
-        good_quality = sum(1 for r in results if r.content_quality == "good")
-        logger.info(f"Completed scraping {successful}/{len(urls)} jobs successfully ({good_quality} good quality)")
+        # One pass for both tallies
+        successful = 0
+        quality_counts = Counter()
+        for r in results:
+            successful += r.success
+            quality_counts[r.content_quality] += 1
+        logger.info("Completed scraping %s/%s jobs successfully (%s good quality)", successful, len(urls), quality_counts['good'])
+        logger.info("Quality breakdown: %s", dict(quality_counts.most_common()))
         return results
 
 def test_flexible_scraper():
@@ -1,16 +1,141 @@
 import os
+import asyncio
+import hashlib
+import ipaddress
 import logging
-from datetime import datetime
-from typing import Dict, Any, List, Optional
-from dataclasses import asdict
+import socket
+import tempfile
+import time
+from collections import Counter
+from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Callable
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
 
-from flexible_job_scraper import FlexibleJobScraper, RawJobData
-from openai_job_processor import OpenAIJobProcessor, ProcessedJobData
+from flexible_job_scraper import FlexibleJobScraper, RawJobData, MAX_CONCURRENT_SCRAPES
+from openai_job_processor import OpenAIJobProcessor, ProcessedJobData, OPENAI_MODEL
 import json
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of scrape + extraction pipelines running at once
+MAX_CONCURRENT_JOBS = 20
+
+# Characters of raw markdown kept in stored and returned results
+RAW_MARKDOWN_SAMPLE_LENGTH = 5000
+
+# Completed jobs between flushes of buffered session logs (one multi-row insert) to Supabase
+LOG_FLUSH_EVERY = 50
+
+# Multi-job progress is logged at most once per PROGRESS_LOG_INTERVAL seconds,
+# plus at every 1/PROGRESS_LOG_STEPS of the batch, instead of once per URL
+PROGRESS_LOG_INTERVAL = 1.0
+PROGRESS_LOG_STEPS = 20
+
+# Origin statuses that mean a posting is gone; anything else (403, 429, 5xx) is
+# often bot blocking the Firecrawl scrape gets past, so it is not trusted
+PREFLIGHT_DEAD_STATUSES = frozenset({404, 410})
+PREFLIGHT_TIMEOUT = 5.0
+PREFLIGHT_SCHEMES = frozenset({'http', 'https'})
+
+# Shared OpenAI connection pool, sized for MAX_CONCURRENT_JOBS in-flight extractions
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+def _is_public_http_url(url: str) -> bool:
+    """
+    Whether url is http(s) and every address its host resolves to is publicly
+    routable, so a preflight request cannot be pointed at the server's own
+    network (loopback, private ranges, link-local metadata endpoints).
+    """
+    try:
+        parts = urlsplit(url)
+        if parts.scheme not in PREFLIGHT_SCHEMES or not parts.hostname:
+            return False
+        infos = socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80),
+                                   proto=socket.IPPROTO_TCP)
+    except (ValueError, OSError):
+        return False
+    return bool(infos) and all(ipaddress.ip_address(info[4][0].split('%')[0]).is_global for info in infos)
+
+def _format_salary_range(salary_min, salary_max, currency: str) -> str:
+    """Display string for a salary band"""
+    return f"{currency} ${salary_min:,} - ${salary_max:,}"
+
+class ExtractionCache:
+    """
+    On-disk cache of AI extraction results, one JSON file per entry.
+    Entries are keyed by provider, model, prompt version, URL and a hash of the
+    raw markdown, so unchanged pages skip the LLM call while any change to the
+    content or the prompt misses.
+    """
+    
+    def __init__(self, cache_dir, provider: str, model: str, prompt_version: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.provider = provider
+        self.model = model
+        self.prompt_version = prompt_version
+    
+    def key(self, url: str, raw_markdown: str) -> str:
+        """Hash each field with an 8-byte length prefix so field boundaries cannot collide"""
+        digest = hashlib.sha256()
+        for part in (self.provider, self.model, self.prompt_version, url, raw_markdown):
+            encoded = part.encode()
+            digest.update(len(encoded).to_bytes(8, 'little'))
+            digest.update(encoded)
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[ProcessedJobData]:
+        """Return the cached extraction, or None on a miss or an unreadable entry"""
+        path = self.cache_dir / f"{key}.json"
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)['data']
+            if data.get('processed_at'):
+                data['processed_at'] = datetime.fromisoformat(data['processed_at'])
+            return ProcessedJobData(**data)
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, TypeError, ValueError, AttributeError) as e:
+            # Corrupt entry or schema change - evict and fall through to a fresh extraction
+            logger.warning("Discarding unreadable extraction cache entry %s: %s", key, e)
+            path.unlink(missing_ok=True)
+            return None
+    
+    def put(self, key: str, url: str, processed_data: ProcessedJobData):
+        """Store an extraction result, writing via a temp file so readers never see a partial entry"""
+        entry = {
+            'cached_at': datetime.now(timezone.utc).isoformat(),
+            'provider': self.provider,
+            'model': self.model,
+            'prompt_version': self.prompt_version,
+            'url': url,
+            'data': processed_data.to_dict(),
+        }
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = None
+        try:
+            # A unique temp file per write, so concurrent puts of one key never share it
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_dir, prefix=f"{key}.",
+                                             suffix='.tmp', delete=False) as f:
+                tmp_path = Path(f.name)
+                json.dump(entry, f, default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Failed to write extraction cache entry %s: %s", key, e)
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
 class IntegratedFlexibleScraper:
     """
     Integrated scraper that combines:
@@ -21,10 +146,71 @@ class IntegratedFlexibleScraper:
     This implements your original flexible approach.
     """
     
-    def __init__(self, firecrawl_api_key: str, supabase_scraper=None):
+    def __init__(self, firecrawl_api_key: str, supabase_scraper=None, cache_dir: Optional[str] = None,
+                 preflight: bool = False, detailed_logging: bool = True):
         self.flexible_scraper = FlexibleJobScraper(firecrawl_api_key)
-        self.ai_processor = OpenAIJobProcessor()
+        # One keep-alive (HTTP/2) client for every OpenAI call, so concurrent jobs
+        # reuse connections instead of paying a TLS handshake each
+        self.http_client = httpx.Client(http2=True, limits=HTTP_POOL_LIMITS, timeout=httpx.Timeout(600.0, connect=5.0))
+        self.ai_processor = OpenAIJobProcessor(http_client=self.http_client)
         self.supabase_scraper = supabase_scraper
+        # Opt-in: check each URL at its origin before paying for a Firecrawl scrape.
+        # Origins are arbitrary hosts, so they get their own short-timeout client
+        # rather than the OpenAI pool
+        self.preflight = preflight
+        self.preflight_client = None
+        if preflight:
+            self.preflight_client = httpx.Client(timeout=PREFLIGHT_TIMEOUT, follow_redirects=False)
+        # Without detailed logging only failed jobs get a scrape_logs row
+        self.detailed_logging = detailed_logging
+        
+        # Session log rows are buffered and written in batches; imported here because
+        # supabase_integration connects on import and is only needed with a scraper
+        self.log_buffer = None
+        if supabase_scraper is not None:
+            from supabase_integration import ScrapeLogBuffer
+            self.log_buffer = ScrapeLogBuffer(supabase_scraper)
+        # Resolved once so per-job logging is a single flag check when rows would be dropped anyway
+        self.log_success_rows = detailed_logging and self.log_buffer is not None
+        
+        # Opt-in extraction cache; the prompt version changes whenever the prompt or schema does
+        self.extraction_cache = None
+        if cache_dir is not None:
+            prompt = self.ai_processor.system_prompt + json.dumps(self.ai_processor.response_schema, sort_keys=True)
+            prompt_version = hashlib.sha256(prompt.encode()).hexdigest()[:16]
+            self.extraction_cache = ExtractionCache(cache_dir, 'openai', OPENAI_MODEL, prompt_version)
+    
+    def close(self):
+        """Write pending session logs and close the shared OpenAI client and the Firecrawl session"""
+        if self.log_buffer is not None:
+            self.log_buffer.close()
+        self.http_client.close()
+        if self.preflight_client is not None:
+            self.preflight_client.close()
+        self.flexible_scraper.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _extract_job_data(self, raw_markdown: str, url: str) -> ProcessedJobData:
+        """Extract structured data with the AI processor, going through the extraction cache when enabled"""
+        if self.extraction_cache is None:
+            return self.ai_processor.extract_job_data(raw_markdown, url)
+        
+        key = self.extraction_cache.key(url, raw_markdown)
+        processed_data = self.extraction_cache.get(key)
+        if processed_data is not None:
+            logger.info("Extraction cache hit for %s", url)
+            return processed_data
+        
+        processed_data = self.ai_processor.extract_job_data(raw_markdown, url)
+        # Only successful extractions carry a conversation log; never cache fallbacks
+        if processed_data.openai_conversation:
+            self.extraction_cache.put(key, url, processed_data)
+        return processed_data
         
     def scrape_and_process_job(self, url: str, session_id: str = None) -> Dict[str, Any]:
         """
@@ -34,95 +220,153 @@ class IntegratedFlexibleScraper:
         3. Process with AI to extract structured data (if quality is good enough)
         4. Store in Supabase
         """
-        logger.info(f"Starting flexible scraping pipeline for: {url}")
+        logger.info("Starting flexible scraping pipeline for: %s", url)
         
         try:
             # Step 1: Scrape raw content
-            raw_data = self.flexible_scraper.scrape_job_raw(url)
-            
-            if not raw_data.success:
-                logger.error(f"Failed to scrape raw content: {raw_data.error_message}")
-                return {
-                    'success': False,
-                    'error': raw_data.error_message,
-                    'stage': 'scraping'
-                }
-            
-            # Step 2: Check content quality before expensive AI processing
-            if raw_data.content_quality == "404":
-                logger.warning(f"Skipping AI processing for 404 error: {raw_data.quality_reason}")
-                # Create minimal processed data for 404 errors
-                processed_data = ProcessedJobData(
-                    confidence_score=0.0,
-                    ai_confidence=0.0,
-                    validation_confidence=0.0,
-                    extraction_notes=[f"404 Error: {raw_data.quality_reason}", "Skipped AI processing"]
-                )
-            elif raw_data.content_quality == "invalid":
-                logger.warning(f"Skipping AI processing for invalid content: {raw_data.quality_reason}")
-                # Create minimal processed data for invalid content
-                processed_data = ProcessedJobData(
-                    confidence_score=0.0,
-                    ai_confidence=0.0,
-                    validation_confidence=0.0,
-                    extraction_notes=[f"Invalid Content: {raw_data.quality_reason}", "Skipped AI processing"]
-                )
-            else:
-                # Step 3: Process with AI (only for good/poor quality content)
-                if raw_data.content_quality == "poor":
-                    logger.warning(f"Processing poor quality content: {raw_data.quality_reason}")
-                
-                processed_data = self.ai_processor.extract_job_data(raw_data.raw_markdown, url)
-                
-                # Adjust confidence based on content quality
-                if raw_data.content_quality == "poor":
-                    # Reduce confidence for poor quality content
-                    processed_data.confidence_score *= 0.5
-                    processed_data.validation_confidence *= 0.5
-                    processed_data.extraction_notes.append(f"Confidence reduced due to poor content quality: {raw_data.quality_reason}")
+            raw_data = self._scrape_raw(url)
             
-            # Step 4: Combine data for storage
-            combined_data = self._combine_data(raw_data, processed_data)
-            
-            # Step 5: Store in Supabase (if available)
-            job_id = None
-            if self.supabase_scraper:
-                try:
-                    job_id = self.supabase_scraper.save_job_posting(combined_data, session_id)
-                    if job_id:
-                        logger.info(f"Saved job to Supabase with ID: {job_id}")
-                    else:
-                        logger.warning("Failed to save to Supabase")
-                except Exception as e:
-                    logger.error(f"Supabase storage error: {e}")
-            
-            return {
-                'success': True,
-                'job_id': job_id,
-                'raw_data': asdict(raw_data),
-                'processed_data': asdict(processed_data),
-                'combined_data': combined_data,
-                'confidence_score': processed_data.confidence_score,
-                'content_quality': raw_data.content_quality,
-                'quality_reason': raw_data.quality_reason
-            }
+            return self._process_raw_job(raw_data, session_id)
             
         except Exception as e:
-            logger.error(f"Error in flexible scraping pipeline: {e}")
+            logger.error("Error in flexible scraping pipeline: %s", e)
             return {
                 'success': False,
                 'error': str(e),
                 'stage': 'processing'
             }
     
-    def _combine_data(self, raw_data: RawJobData, processed_data: ProcessedJobData) -> Dict[str, Any]:
-        """Combine raw and processed data into format expected by Supabase storage"""
+    def _scrape_raw(self, url: str) -> RawJobData:
+        """Scrape raw content with Firecrawl, unless the origin already says the posting is gone"""
+        raw_data = self._preflight(url) if self.preflight else None
+        if raw_data is None:
+            raw_data = self.flexible_scraper.scrape_job_raw(url)
+        return raw_data
+    
+    def _preflight(self, url: str) -> Optional[RawJobData]:
+        """
+        Cheap HEAD request to the origin. Returns 404-quality RawJobData when the
+        posting is definitely gone, or None to go ahead with the Firecrawl scrape.
+        Only public http(s) hosts are contacted and redirects are not followed,
+        so a redirect just means the page exists and Firecrawl handles it.
+        """
+        if not _is_public_http_url(url):
+            logger.debug("Preflight skipped for non-public URL %s", url)
+            return None
+        
+        try:
+            response = self.preflight_client.head(url)
+            if response.status_code in (405, 501):
+                # HEAD not supported - fetch the first KB instead
+                with self.preflight_client.stream('GET', url, headers={'Range': 'bytes=0-1023'}) as response:
+                    pass
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            logger.debug("Preflight check failed for %s, scraping anyway: %s", url, e)
+            return None
+        
+        if response.status_code not in PREFLIGHT_DEAD_STATUSES:
+            return None
+        
+        logger.info("Preflight: %s returned HTTP %s, skipping Firecrawl", url, response.status_code)
+        return RawJobData(
+            url=url,
+            scraped_at=datetime.now(timezone.utc),
+            ats_platform=self.flexible_scraper.detect_ats_platform(url),
+            success=True,
+            content_quality="404",
+            quality_reason=f"Origin returned HTTP {response.status_code}"
+        )
+    
+    def _process_raw_job(self, raw_data: RawJobData, session_id: str = None,
+                         processed_data: Optional[ProcessedJobData] = None) -> Dict[str, Any]:
+        """
+        Run the pipeline steps after scraping: quality gating, AI extraction,
+        combining and storage. processed_data, if given, is used instead of
+        extracting (e.g. results of a batch extraction).
+        """
+        if not raw_data.success:
+            logger.error("Failed to scrape raw content: %s", raw_data.error_message)
+            return {
+                'success': False,
+                'error': raw_data.error_message,
+                'stage': 'scraping'
+            }
+        
+        # Step 2: Check content quality before expensive AI processing. Pages that
+        # are not job postings skip extraction and are stored as a minimal record,
+        # without serializing the page content
+        if raw_data.content_quality in ("404", "invalid"):
+            if raw_data.content_quality == "404":
+                logger.warning("Skipping AI processing for 404 error: %s", raw_data.quality_reason)
+                skipped_reason = f"404 Error: {raw_data.quality_reason}"
+            else:
+                logger.warning("Skipping AI processing for invalid content: %s", raw_data.quality_reason)
+                skipped_reason = f"Invalid Content: {raw_data.quality_reason}"
+            processed_dict = None
+            confidence_score = 0.0
+            combined_data = self._combine_data_minimal(raw_data, skipped_reason)
+        else:
+            # Step 3: Process with AI (only for good/poor quality content)
+            if raw_data.content_quality == "poor":
+                logger.warning("Processing poor quality content: %s", raw_data.quality_reason)
+            
+            if processed_data is None:
+                processed_data = self._extract_job_data(raw_data.raw_markdown, raw_data.url)
+            
+            # Adjust confidence based on content quality
+            if raw_data.content_quality == "poor":
+                # Reduce confidence for poor quality content
+                processed_data.confidence_score *= 0.5
+                processed_data.validation_confidence *= 0.5
+                processed_data.extraction_notes.append(f"Confidence reduced due to poor content quality: {raw_data.quality_reason}")
+            
+            # Step 4: Combine data for storage, converting each dataclass once; the
+            # processed dict is shared with the return value
+            raw_dict = self._retained_raw_dict(raw_data)
+            processed_dict = self._to_json_dict(processed_data)
+            confidence_score = processed_data.confidence_score
+            combined_data = self._combine_data(raw_data, processed_data, raw_dict, processed_dict)
+        
+        # Step 5: Store in Supabase (if available)
+        job_id = None
+        if self.supabase_scraper:
+            try:
+                job_id = self.supabase_scraper.save_job_posting(combined_data, session_id)
+                if job_id:
+                    logger.info("Saved job to Supabase with ID: %s", job_id)
+                else:
+                    logger.warning("Failed to save to Supabase")
+            except Exception as e:
+                logger.error("Supabase storage error: %s", e)
+        
+        return {
+            'success': True,
+            'job_id': job_id,
+            'raw_data': self._raw_summary(raw_data),
+            'processed_data': processed_dict,
+            'combined_data': combined_data,
+            'confidence_score': confidence_score,
+            'content_quality': raw_data.content_quality,
+            'quality_reason': raw_data.quality_reason
+        }
+    
+    def _combine_data(self, raw_data: RawJobData, processed_data: ProcessedJobData,
+                      raw_dict: Optional[Dict[str, Any]] = None,
+                      processed_dict: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Combine raw and processed data into format expected by Supabase storage.
+        raw_dict/processed_dict are the already-serialized dataclasses, if the caller has them.
+        """
+        if raw_dict is None:
+            raw_dict = self._retained_raw_dict(raw_data)
+        if processed_dict is None:
+            processed_dict = self._to_json_dict(processed_data)
         
         # Format salary range from min/max or text
         salary_range = ""
         if processed_data.salary_min and processed_data.salary_max:
             currency = processed_data.salary_currency or "USD"
-            salary_range = f"{currency} ${processed_data.salary_min:,} - ${processed_data.salary_max:,}"
+            salary_range = _format_salary_range(processed_data.salary_min, processed_data.salary_max, currency)
         elif processed_data.salary_text:
             salary_range = processed_data.salary_text
         
@@ -138,84 +382,353 @@ class IntegratedFlexibleScraper:
             'description': processed_data.job_description or '',
             'requirements': processed_data.requirements or [],
             'benefits': processed_data.benefits or [],
-            'skills': processed_data.required_skills + processed_data.preferred_skills,  # Combine skills
+            'skills': [*processed_data.required_skills, *processed_data.preferred_skills],  # Combine skills
             'application_url': raw_data.url,  # For now, same as job URL
             'application_email': None,  # Could extract with better AI
             'application_form_structure': {},  # Placeholder
             'source_platform': raw_data.ats_platform,
                          'raw_data': {
                  # Store the original processed data for reference (with date serialization)
-                 'ai_extracted': self._serialize_datetime_fields(asdict(processed_data)),
-                 'raw_scraped': self._serialize_datetime_fields(asdict(raw_data)),
+                 'ai_extracted': processed_dict,
+                 'raw_scraped': raw_dict,
                  'confidence_score': processed_data.confidence_score,
                  'ai_confidence': processed_data.ai_confidence,
                  'validation_confidence': processed_data.validation_confidence,
-                 'extraction_notes': processed_data.extraction_notes,
+                 'extraction_notes': processed_dict['extraction_notes'],
                  'scraping_method': 'flexible_ai',
                  'content_length': len(raw_data.raw_markdown),
                  # Store truncated raw content for future reprocessing
-                 'raw_markdown_sample': raw_data.raw_markdown[:5000] if raw_data.raw_markdown else '',
+                 'raw_markdown_sample': raw_data.raw_markdown[:RAW_MARKDOWN_SAMPLE_LENGTH] if raw_data.raw_markdown else '',
              }
         }
         
         return combined_job_data
     
+    def _raw_summary(self, raw_data: RawJobData) -> Dict[str, Any]:
+        """
+        Scrape fields callers read from a result. The full serialized scrape is
+        stored under combined_data['raw_data']['raw_scraped'], so it is not repeated here.
+        """
+        return {
+            'url': raw_data.url,
+            'title': raw_data.title,
+            'scraped_at': raw_data.scraped_at.isoformat(),
+            'ats_platform': raw_data.ats_platform,
+            'content_quality': raw_data.content_quality,
+            'quality_reason': raw_data.quality_reason,
+            'content_length': len(raw_data.raw_markdown),
+        }
+    
+    def _combine_data_minimal(self, raw_data: RawJobData, skipped_reason: str) -> Dict[str, Any]:
+        """Storage record for a page skipped before AI processing (404 or invalid content)"""
+        return {
+            'url': raw_data.url,
+            'title': 'Unknown Title',
+            'company': 'Unknown Company',
+            'source_platform': raw_data.ats_platform,
+            'skipped_reason': skipped_reason,
+            'raw_data': {
+                'scraping_method': 'flexible_ai',
+                'content_quality': raw_data.content_quality,
+                'quality_reason': raw_data.quality_reason,
+                'confidence_score': 0.0,
+                'extraction_notes': [skipped_reason, "Skipped AI processing"],
+                'content_length': len(raw_data.raw_markdown),
+            }
+        }
+    
+    def _retained_raw_dict(self, raw_data: RawJobData) -> Dict[str, Any]:
+        """
+        Serialized scrape for storage and results. Only the extraction needs the
+        full page, so the copy is built from a sample of the markdown and html
+        and the full strings are never serialized.
+        """
+        sample = replace(
+            raw_data,
+            raw_markdown=raw_data.raw_markdown[:RAW_MARKDOWN_SAMPLE_LENGTH],
+            raw_html=raw_data.raw_html[:RAW_MARKDOWN_SAMPLE_LENGTH],
+        )
+        return self._to_json_dict(sample)
+    
+    def _to_json_dict(self, data) -> Dict[str, Any]:
+        """Convert a dataclass to a JSON-safe dict with datetimes as ISO strings"""
+        if orjson is not None:
+            # orjson walks dataclasses and formats datetimes in C, replacing to_dict plus the Python-level walk
+            try:
+                return orjson.loads(orjson.dumps(data))
+            except orjson.JSONEncodeError:
+                pass
+        return self._serialize_datetime_fields(data.to_dict())
+    
     def _serialize_datetime_fields(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert datetime objects to ISO format strings for JSON serialization"""
-        if isinstance(data, dict):
-            return {k: self._serialize_datetime_fields(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._serialize_datetime_fields(item) for item in data]
-        elif isinstance(data, datetime):
+        """
+        Convert datetime objects to ISO format strings for JSON serialization.
+        Dicts and lists are updated in place (callers pass a fresh to_dict copy),
+        walking with an explicit stack instead of one recursive call per node.
+        """
+        if isinstance(data, datetime):
             return data.isoformat()
-        else:
+        if not isinstance(data, (dict, list)):
             return data
+        
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in items:
+                value_type = type(value)
+                # Exact-type checks first; leaf strings and numbers are the common case
+                if value_type is str or value_type is int or value_type is float or value is None:
+                    continue
+                if value_type is dict or value_type is list:
+                    stack.append(value)
+                elif isinstance(value, datetime):
+                    node[key] = value.isoformat()
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        return data
     
-    def scrape_multiple_jobs_flexible(self, urls: List[str], session_id: str = None) -> List[Dict[str, Any]]:
-        """Scrape multiple jobs using the flexible approach"""
-        results = []
+    async def _run_staged_job(self, url: str, index: int, total: int, session_id: Optional[str],
+                              scrape_slots: asyncio.Semaphore, executor: ThreadPoolExecutor) -> Dict[str, Any]:
+        """
+        Run one URL of a multi-job scrape as two stages. Only the Firecrawl stage
+        takes a scrape slot, so while some jobs wait on OpenAI others are already scraping.
+        """
+        logger.debug("Processing job %s/%s: %s", index + 1, total, url)
+        if self.log_success_rows:
+            self._buffer_log(session_id, url, 'info', f"Starting flexible scrape {index+1}/{total}")
         
-        for i, url in enumerate(urls):
-            logger.info(f"Processing job {i+1}/{len(urls)}: {url}")
-            
-            # Log progress if session tracking is available
-            if self.supabase_scraper and session_id:
+        loop = asyncio.get_running_loop()
+        try:
+            async with scrape_slots:
+                raw_data = await loop.run_in_executor(executor, self._scrape_raw, url)
+            result = await loop.run_in_executor(executor, self._process_raw_job, raw_data, session_id)
+        except Exception as e:
+            logger.error("Error in flexible scraping pipeline: %s", e)
+            result = {
+                'success': False,
+                'error': str(e),
+                'stage': 'processing'
+            }
+        
+        self._log_job_result(session_id, url, result)
+        return result
+    
+    def _log_job_result(self, session_id: Optional[str], url: str, result: Dict[str, Any]):
+        """Buffer a session log row for a job's outcome with quality information"""
+        if self.log_buffer is None:
+            return
+        if result['success']:
+            if not self.log_success_rows:
+                return
+            quality = result.get('content_quality', 'unknown')
+            confidence = result.get('confidence_score', 0)
+            if quality == "404":
+                message = f"404 Error detected - {result.get('quality_reason', 'Page not found')}"
+            elif quality == "invalid":
+                message = f"Invalid content - {result.get('quality_reason', 'Content validation failed')}"
+            elif quality == "poor":
+                message = f"Poor quality content processed with reduced confidence {confidence:.2f}"
+            else:
+                message = f"Successfully processed with confidence {confidence:.2f}"
+            self._buffer_log(session_id, url, 'info', message)
+        else:
+            self._buffer_log(session_id, url, 'error', result.get('error', 'Unknown error'),
+                             {'stage': result.get('stage', 'unknown')})
+    
+    def _buffer_log(self, session_id: Optional[str], url: str, level: str, message: str,
+                    error_details: Optional[Dict[str, Any]] = None):
+        """Queue a scrape_logs row, if session tracking is available; written by _flush_session_logs"""
+        if not (self.log_buffer and session_id):
+            return
+        
+        self.log_buffer.add(session_id, url, level, message, error_details)
+    
+    def _flush_session_logs(self, session_id: Optional[str], completed: int):
+        """Write buffered log rows in one insert and record the session's progress"""
+        if not (self.log_buffer and session_id):
+            return
+        
+        try:
+            self.log_buffer.flush()
+            self.supabase_scraper.update_session_progress(session_id, completed)
+        except Exception as e:
+            logger.warning("Failed to log progress: %s", e)
+    
+    def _log_summary(self, total: int, successful: int, quality_counts: Counter):
+        """Log success and content-quality totals for a multi-job scrape"""
+        logger.info("Flexible scraping completed: %s/%s successful", successful, total)
+        logger.info("Quality breakdown: %s good, %s poor, %s 404 errors, %s invalid", quality_counts['good'], quality_counts['poor'], quality_counts['404'], quality_counts['invalid'])
+    
+    async def iter_scrape_multiple_jobs_flexible_async(self, urls: List[str], session_id: str = None,
+                                                       progress_callback: Optional[Callable[[int], None]] = None,
+                                                       max_concurrency: int = MAX_CONCURRENT_JOBS,
+                                                       scrape_concurrency: int = MAX_CONCURRENT_SCRAPES):
+        """
+        Scrape multiple jobs concurrently, yielding (index, result) pairs as each job
+        finishes so callers can handle results without holding them all in memory.
+        At most max_concurrency jobs are in flight, and new ones only start as the
+        caller consumes results. Within those, at most scrape_concurrency are in the
+        Firecrawl stage at once; the rest are in (or waiting for) AI extraction.
+        progress_callback, if given, is called with the number of completed URLs as each job finishes.
+        """
+        total = len(urls)
+        scrape_slots = asyncio.Semaphore(scrape_concurrency)
+        # Own thread pool: the loop's default executor may have fewer threads than both stages need
+        executor = ThreadPoolExecutor(max_workers=max_concurrency + scrape_concurrency)
+        in_flight = {}
+        next_index = 0
+        completed = 0
+        successful = 0
+        quality_counts = Counter()
+        report_every = max(1, total // PROGRESS_LOG_STEPS)
+        last_report = time.monotonic()
+        
+        try:
+            while next_index < total or in_flight:
+                while next_index < total and len(in_flight) < max_concurrency:
+                    task = asyncio.ensure_future(self._run_staged_job(
+                        urls[next_index], next_index, total, session_id, scrape_slots, executor
+                    ))
+                    in_flight[task] = next_index
+                    next_index += 1
+                
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = in_flight.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.error("Error processing %s: %s", urls[index], e)
+                        result = {
+                            'success': False,
+                            'error': str(e),
+                            'stage': 'processing'
+                        }
+                    
+                    completed += 1
+                    successful += result['success']
+                    quality_counts[result.get('content_quality')] += 1
+                    if progress_callback:
+                        progress_callback(completed)
+                    now = time.monotonic()
+                    if completed % report_every == 0 or now - last_report >= PROGRESS_LOG_INTERVAL:
+                        logger.info("Processed %s/%s jobs (%s successful, %s failed)",
+                                    completed, total, successful, completed - successful)
+                        last_report = now
+                    if completed % LOG_FLUSH_EVERY == 0:
+                        await asyncio.to_thread(self._flush_session_logs, session_id, completed)
+                    
+                    yield index, result
+        finally:
+            # Abandoned early: jobs already running finish on their threads, but no new ones start
+            for task in in_flight:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            await asyncio.to_thread(self._flush_session_logs, session_id, completed)
+            self._log_summary(completed, successful, quality_counts)
+    
+    def iter_scrape_multiple_jobs_flexible(self, urls: List[str], session_id: str = None,
+                                           progress_callback: Optional[Callable[[int], None]] = None):
+        """
+        Synchronous generator over iter_scrape_multiple_jobs_flexible_async, driving it
+        on a private event loop. Yields (index, result) pairs in completion order.
+        """
+        loop = asyncio.new_event_loop()
+        results = self.iter_scrape_multiple_jobs_flexible_async(urls, session_id, progress_callback)
+        try:
+            while True:
                 try:
-                    self.supabase_scraper.update_session_progress(session_id, i, url)
-                    self.supabase_scraper.log_scrape_info(session_id, url, f"Starting flexible scrape {i+1}/{len(urls)}")
-                except Exception as e:
-                    logger.warning(f"Failed to log progress: {e}")
-            
-            result = self.scrape_and_process_job(url, session_id)
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(results.aclose())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+    
+    async def scrape_multiple_jobs_flexible_async(self, urls: List[str], session_id: str = None,
+                                                  progress_callback: Optional[Callable[[int], None]] = None,
+                                                  max_concurrency: int = MAX_CONCURRENT_JOBS) -> List[Dict[str, Any]]:
+        """
+        Scrape multiple jobs concurrently, with at most max_concurrency pipelines
+        (Firecrawl scrape + AI extraction) in flight. Results are returned in input order.
+        progress_callback, if given, is called with the number of completed URLs as each job finishes.
+        """
+        results = [None] * len(urls)
+        async for index, result in self.iter_scrape_multiple_jobs_flexible_async(
+                urls, session_id, progress_callback, max_concurrency):
+            results[index] = result
+        return results
+    
+    def scrape_multiple_jobs_flexible(self, urls: List[str], session_id: str = None,
+                                      progress_callback: Optional[Callable[[int], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Scrape multiple jobs using the flexible approach.
+        Synchronous entry point that runs scrape_multiple_jobs_flexible_async on a fresh event loop.
+        """
+        return asyncio.run(self.scrape_multiple_jobs_flexible_async(urls, session_id, progress_callback))
+    
+    def scrape_multiple_jobs_batch(self, urls: List[str], session_id: str = None,
+                                   progress_callback: Optional[Callable[[int], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Scrape multiple jobs in two passes for bulk sessions that can wait:
+        1. Scrape all raw content with Firecrawl batch scraping
+        2. Extract every good/poor page with a single OpenAI Batch job (half price, up to 24h turnaround)
+        Results are returned in input order. progress_callback, if given, is called with the
+        number of completed URLs once all results are assembled.
+        """
+        raw_jobs = self.flexible_scraper.scrape_multiple_jobs_raw(urls)
+        
+        # Pages that need extraction, minus any already in the extraction cache
+        processed = {}
+        pending = []
+        for i, raw_data in enumerate(raw_jobs):
+            if not (raw_data.success and raw_data.content_quality in ("good", "poor")):
+                continue
+            if self.extraction_cache is not None:
+                cached = self.extraction_cache.get(self.extraction_cache.key(raw_data.url, raw_data.raw_markdown))
+                if cached is not None:
+                    processed[i] = cached
+                    continue
+            pending.append(i)
+        
+        logger.info("Batch extraction: %s pages submitted, %s from cache", len(pending), len(processed))
+        extracted = self.ai_processor.extract_job_data_batch(
+            [(raw_jobs[i].raw_markdown, raw_jobs[i].url) for i in pending]
+        )
+        for i, processed_data in zip(pending, extracted):
+            processed[i] = processed_data
+            if self.extraction_cache is not None and processed_data.openai_conversation:
+                self.extraction_cache.put(
+                    self.extraction_cache.key(raw_jobs[i].url, raw_jobs[i].raw_markdown),
+                    raw_jobs[i].url,
+                    processed_data
+                )
+        
+        results = []
+        successful = 0
+        quality_counts = Counter()
+        for i, (url, raw_data) in enumerate(zip(urls, raw_jobs)):
+            try:
+                result = self._process_raw_job(raw_data, session_id, processed.get(i))
+            except Exception as e:
+                logger.error("Error in flexible scraping pipeline: %s", e)
+                result = {
+                    'success': False,
+                    'error': str(e),
+                    'stage': 'processing'
+                }
+            self._log_job_result(session_id, url, result)
             results.append(result)
-            
-            # Log result with quality information
-            if self.supabase_scraper and session_id:
-                try:
-                    if result['success']:
-                        quality = result.get('content_quality', 'unknown')
-                        confidence = result.get('confidence_score', 0)
-                        if quality == "404":
-                            self.supabase_scraper.log_scrape_info(session_id, url, f"404 Error detected - {result.get('quality_reason', 'Page not found')}")
-                        elif quality == "invalid":
-                            self.supabase_scraper.log_scrape_info(session_id, url, f"Invalid content - {result.get('quality_reason', 'Content validation failed')}")
-                        elif quality == "poor":
-                            self.supabase_scraper.log_scrape_info(session_id, url, f"Poor quality content processed with reduced confidence {confidence:.2f}")
-                        else:
-                            self.supabase_scraper.log_scrape_info(session_id, url, f"Successfully processed with confidence {confidence:.2f}")
-                    else:
-                        self.supabase_scraper.log_scrape_error(session_id, url, result.get('error', 'Unknown error'), {'stage': result.get('stage', 'unknown')})
-                except Exception as e:
-                    logger.warning(f"Failed to log result: {e}")
-        
-        successful = sum(1 for r in results if r['success'])
-        good_quality = sum(1 for r in results if r.get('content_quality') == 'good')
-        poor_quality = sum(1 for r in results if r.get('content_quality') == 'poor')
-        errors_404 = sum(1 for r in results if r.get('content_quality') == '404')
-        invalid = sum(1 for r in results if r.get('content_quality') == 'invalid')
-        
-        logger.info(f"Flexible scraping completed: {successful}/{len(urls)} successful")
-        logger.info(f"Quality breakdown: {good_quality} good, {poor_quality} poor, {errors_404} 404 errors, {invalid} invalid")
+            successful += result['success']
+            quality_counts[result.get('content_quality')] += 1
+        
+        self._flush_session_logs(session_id, len(results))
+        if progress_callback:
+            progress_callback(len(results))
+        
+        self._log_summary(len(results), successful, quality_counts)
         return results
 
 def demo_integrated_flexible():
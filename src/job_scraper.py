@@ -5,19 +5,71 @@ Extracts job details and application form structures from job posting URLs
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import copy
 import json
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 import re
 
+from scrape_cache import ScrapeCache, SCRAPE_CACHE_TTL
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Salary parsing: characters stripped before numbers are read, and the numbers themselves
+SALARY_NOISE_PATTERN = re.compile(r'[^\d\-–—$€£¥,K\s]')
+SALARY_NUMBER_PATTERN = re.compile(r'[\d,]+')
+
+# One case-insensitive scan for every supported ATS domain; the matching
+# group's name is the platform
+ATS_PLATFORM_PATTERN = re.compile(
+    r"(?P<ashby>ashbyhq\.com)"
+    r"|(?P<greenhouse>greenhouse\.io)"
+    r"|(?P<lever>lever\.co)"
+    r"|(?P<workable>workable\.com)"
+    r"|(?P<smartrecruiters>smartrecruiters\.com)"
+    r"|(?P<bamboohr>bamboohr\.com)"
+    r"|(?P<icims>icims\.com)"
+    r"|(?P<jobvite>jobvite\.com)",
+    re.IGNORECASE
+)
+
+@lru_cache(maxsize=4096)
+def _detect_ats_platform(url: str) -> str:
+    """Return the ATS platform name for a URL, or 'unknown'; URLs repeat across retries and cached scrapes"""
+    match = ATS_PLATFORM_PATTERN.search(url)
+    return match.lastgroup if match else "unknown"
+
+def record_to_dict(record) -> Dict[str, Any]:
+    """
+    Equivalent of dataclasses.asdict for the slotted records below, reading
+    fields straight from __slots__ instead of asdict's reflective, recursive
+    walk. Lists are copied and dicts deep-copied.
+    """
+    data = {}
+    for name in record.__slots__:
+        value = getattr(record, name)
+        if isinstance(value, list):
+            value = list(value)
+        elif isinstance(value, dict):
+            value = copy.deepcopy(value)
+        data[name] = value
+    return data
+
+@dataclass(slots=True)
 class JobPosting:
     """Data class for job posting information"""
     url: str
@@ -51,7 +103,7 @@ class JobPosting:
         if self.metadata is None:
             self.metadata = {}
 
-@dataclass
+@dataclass(slots=True)
 class ApplicationForm:
     """Data class for application form information"""
     form_url: Optional[str] = None
@@ -61,7 +113,7 @@ class ApplicationForm:
     has_captcha: bool = False
     autofill_available: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class FormField:
     """Data class for form field information"""
     field_name: str
@@ -86,7 +138,25 @@ class FormField:
         if self.conditional_logic is None:
             self.conditional_logic = {}
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form matching record_to_dict; built as one literal since forms have many fields"""
+        return {
+            'field_name': self.field_name,
+            'field_label': self.field_label,
+            'field_type': self.field_type,
+            'field_placeholder': self.field_placeholder,
+            'is_required': self.is_required,
+            'field_order': self.field_order,
+            'validation_rules': copy.deepcopy(self.validation_rules),
+            'options': list(self.options),
+            'default_value': self.default_value,
+            'help_text': self.help_text,
+            'section_name': self.section_name,
+            'visibility': self.visibility,
+            'conditional_logic': copy.deepcopy(self.conditional_logic),
+        }
+
+@dataclass(slots=True)
 class CompetencyQuestion:
     """Data class for competency-based questions"""
     question_text: str
@@ -98,10 +168,26 @@ class CompetencyQuestion:
     section_name: Optional[str] = None
     help_text: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form matching record_to_dict; every field is a scalar"""
+        return {
+            'question_text': self.question_text,
+            'question_type': self.question_type,
+            'is_required': self.is_required,
+            'word_limit': self.word_limit,
+            'character_limit': self.character_limit,
+            'question_order': self.question_order,
+            'section_name': self.section_name,
+            'help_text': self.help_text,
+        }
+
 class JobScraper:
     """Main job scraper class using Firecrawl API"""
     
-    def __init__(self, firecrawl_api_key: str):
+    # (connect, read) seconds; the read budget covers Firecrawl rendering the page
+    REQUEST_TIMEOUT = (3.05, 60)
+    
+    def __init__(self, firecrawl_api_key: str, cache_ttl: float = SCRAPE_CACHE_TTL):
         self.api_key = firecrawl_api_key
         self.base_url = "https://api.firecrawl.dev/v1"
         self.headers = {
@@ -109,32 +195,57 @@ class JobScraper:
             "Authorization": f"Bearer {self.api_key}"
         }
         
+        # Reuse one pooled keep-alive connection for every Firecrawl call
+        # instead of a fresh TCP+TLS handshake per request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET", "POST"})
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(self.headers)
+        self.session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+        
+        # Repeated URLs within cache_ttl seconds skip both Firecrawl calls
+        self.cache = ScrapeCache(ttl=cache_ttl)
+        
+    def close(self):
+        """Close the pooled HTTP session"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _post_scrape(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a payload to the Firecrawl scrape endpoint and decode the JSON response"""
+        if orjson is not None:
+            # orjson encodes/decodes in C, noticeably faster on large markdown payloads
+            response = self.session.post(f"{self.base_url}/scrape", data=orjson.dumps(payload),
+                                         timeout=self.REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        
+        response = self.session.post(f"{self.base_url}/scrape", json=payload, timeout=self.REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+        
     def detect_ats_platform(self, url: str) -> str:
         """Detect the ATS platform from the URL"""
-        url_lower = url.lower()
-        
-        if "ashbyhq.com" in url_lower:
-            return "ashby"
-        elif "greenhouse.io" in url_lower or "boards.greenhouse.io" in url_lower:
-            return "greenhouse"
-        elif "lever.co" in url_lower:
-            return "lever"
-        elif "workable.com" in url_lower:
-            return "workable"
-        elif "smartrecruiters.com" in url_lower:
-            return "smartrecruiters"
-        elif "bamboohr.com" in url_lower:
-            return "bamboohr"
-        elif "icims.com" in url_lower:
-            return "icims"
-        elif "jobvite.com" in url_lower:
-            return "jobvite"
-        else:
-            return "unknown"
+        return _detect_ats_platform(url)
     
     def scrape_job_overview(self, url: str) -> Dict[str, Any]:
         """Scrape job overview information using Firecrawl"""
-        logger.info(f"Scraping job overview from: {url}")
+        logger.info("Scraping job overview from: %s", url)
         
         # Define schema for job overview extraction
         job_schema = {
@@ -167,23 +278,20 @@ class JobScraper:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/scrape", headers=self.headers, json=payload)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._post_scrape(payload)
             if result.get('success'):
                 return result['data']
             else:
-                logger.error(f"Failed to scrape job overview: {result}")
+                logger.error("Failed to scrape job overview: %s", result)
                 return {}
                 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error scraping job overview: {e}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("Error scraping job overview: %s", e)
             return {}
     
     def scrape_application_form(self, url: str) -> Dict[str, Any]:
         """Scrape application form structure using Firecrawl Actions"""
-        logger.info(f"Scraping application form from: {url}")
+        logger.info("Scraping application form from: %s", url)
         
         # Try to navigate to application page
         application_url = url
@@ -245,18 +353,15 @@ class JobScraper:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/scrape", headers=self.headers, json=payload)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._post_scrape(payload)
             if result.get('success'):
                 return result['data']
             else:
-                logger.error(f"Failed to scrape application form: {result}")
+                logger.error("Failed to scrape application form: %s", result)
                 return {}
                 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error scraping application form: {e}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("Error scraping application form: %s", e)
             return {}
     
     def parse_salary(self, salary_text: str) -> Dict[str, Any]:
@@ -265,7 +370,7 @@ class JobScraper:
             return {"salary_min": None, "salary_max": None, "salary_currency": "USD", "salary_text": None}
         
         # Remove common prefixes and clean up
-        cleaned = re.sub(r'[^\d\-–—$€£¥,K\s]', '', salary_text.upper())
+        cleaned = SALARY_NOISE_PATTERN.sub('', salary_text.upper())
         
         # Extract currency
         currency = "USD"
@@ -277,7 +382,7 @@ class JobScraper:
             currency = "JPY"
         
         # Extract numbers
-        numbers = re.findall(r'[\d,]+', cleaned)
+        numbers = SALARY_NUMBER_PATTERN.findall(cleaned)
         if not numbers:
             return {"salary_min": None, "salary_max": None, "salary_currency": currency, "salary_text": salary_text}
         
@@ -373,34 +478,43 @@ class JobScraper:
             competency_questions.append(question)
         
         return {
-            'job_posting': asdict(job_posting),
-            'application_form': asdict(application_form),
-            'form_fields': [asdict(field) for field in form_fields],
-            'competency_questions': [asdict(question) for question in competency_questions]
+            'job_posting': record_to_dict(job_posting),
+            'application_form': record_to_dict(application_form),
+            'form_fields': [field.to_dict() for field in form_fields],
+            'competency_questions': [question.to_dict() for question in competency_questions]
         }
     
     def scrape_job(self, url: str) -> Dict[str, Any]:
         """Main method to scrape a complete job posting"""
-        logger.info(f"Starting complete job scrape for: {url}")
+        cached = self.cache.get(url)
+        if cached is not None:
+            logger.info("Using cached job data for: %s", url)
+            return cached
+        
+        logger.info("Starting complete job scrape for: %s", url)
         
         try:
-            # Scrape job overview
-            overview_data = self.scrape_job_overview(url)
+            # The overview and application form scrapes are independent,
+            # so issue both Firecrawl requests concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                overview_future = executor.submit(self.scrape_job_overview, url)
+                form_future = executor.submit(self.scrape_application_form, url)
+                overview_data = overview_future.result()
+                form_data = form_future.result()
+            
             if not overview_data:
-                logger.error(f"Failed to scrape job overview for {url}")
+                logger.error("Failed to scrape job overview for %s", url)
                 return {}
             
-            # Scrape application form
-            form_data = self.scrape_application_form(url)
-            
             # Process and structure the data
             processed_data = self.process_job_data(url, overview_data, form_data)
+            self.cache.put(url, processed_data)
             
-            logger.info(f"Successfully scraped job: {processed_data['job_posting']['job_title']} at {processed_data['job_posting']['company_name']}")
+            logger.info("Successfully scraped job: %s at %s", processed_data['job_posting']['job_title'], processed_data['job_posting']['company_name'])
             return processed_data
             
         except Exception as e:
-            logger.error(f"Error scraping job {url}: {e}")
+            logger.error("Error scraping job %s: %s", url, e)
             return {}
     
     def scrape_multiple_jobs(self, urls: List[str]) -> List[Dict[str, Any]]:
@@ -408,7 +522,7 @@ class JobScraper:
         results = []
         
         for i, url in enumerate(urls):
-            logger.info(f"Scraping job {i+1}/{len(urls)}: {url}")
+            logger.info("Scraping job %s/%s: %s", i+1, len(urls), url)
             
             result = self.scrape_job(url)
             if result:
@@ -418,7 +532,7 @@ class JobScraper:
             if i < len(urls) - 1:
                 time.sleep(2)  # 2 second delay between requests
         
-        logger.info(f"Completed scraping {len(results)}/{len(urls)} jobs successfully")
+        logger.info("Completed scraping %s/%s jobs successfully", len(results), len(urls))
         return results
 
 def main():
@@ -434,15 +548,14 @@ def main():
         print("Please set your Firecrawl API key in a .env file")
         return
     
-    scraper = JobScraper(api_key)
-    
     # Example job URLs
     test_urls = [
         "https://jobs.ashbyhq.com/Paradigm/8920e2ac-4bc7-4daf-b540-117ab4801b4a"
     ]
     
     # Scrape jobs
-    results = scraper.scrape_multiple_jobs(test_urls)
+    with JobScraper(api_key) as scraper:
+        results = scraper.scrape_multiple_jobs(test_urls)
     
     # Save results to file
     output_file = 'scraped_jobs.json'
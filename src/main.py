@@ -1,6 +1,7 @@
 import os
 import sys
 import logging
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -15,13 +16,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# The log format uses none of the thread, process or caller fields, so skip
+# collecting them for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging._srcfile = None
+
 from flask import Flask, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from src.models.user import db
 from src.routes.user import user_bp
 from src.routes.jobs import jobs_bp
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from whitenoise import WhiteNoise
+except ImportError:
+    WhiteNoise = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Encodes responses with orjson, which is much faster on large scrape result
+    lists. Dates and dataclasses still go through Flask's default hook so the
+    output matches the stock provider; anything orjson rejects falls back to it.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 # Configuration from environment variables
 secret_key = os.getenv('SECRET_KEY')
@@ -40,6 +79,12 @@ logger.info(f"Secret key loaded from environment: {'Yes' if app.config['SECRET_K
 # Enable CORS for all routes
 CORS(app)
 
+# With whitenoise installed, built frontend files are served from a file index
+# built once at startup, with caching headers, before requests reach Flask;
+# serve() below is then only the SPA fallback to index.html
+if WhiteNoise is not None:
+    app.wsgi_app = WhiteNoise(app.wsgi_app, root=app.static_folder, index_file=True, autorefresh=app.config['DEBUG'])
+
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(jobs_bp, url_prefix='/api')
 
@@ -50,30 +95,51 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 logger.info(f"Database path: {db_path}")
 
-try:
-    db.init_app(app)
+db.init_app(app)
+
+def init_db():
+    """Create the database directory and any missing tables"""
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
     with app.app_context():
         db.create_all()
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create the database tables (run once per deploy when INIT_DB=False)"""
+    init_db()
     logger.info("Database initialized successfully")
-except Exception as e:
-    logger.error(f"Database initialization failed: {e}")
-    raise
+
+# Deploys that run `flask --app src.main init-db` once can set INIT_DB=False
+# to skip the schema check on every process start
+if os.getenv('INIT_DB', 'True').lower() == 'true':
+    try:
+        init_db()
+        logger.info("Database initialized successfully")
+    except Exception as e:
+        logger.error(f"Database initialization failed: {e}")
+        raise
+
+STATIC_ROOT = Path(app.static_folder)
+
+def scan_static_files() -> frozenset:
+    """Paths (relative, with forward slashes) of every file under the static folder"""
+    if not STATIC_ROOT.is_dir():
+        return frozenset()
+    return frozenset(p.relative_to(STATIC_ROOT).as_posix() for p in STATIC_ROOT.rglob('*') if p.is_file())
+
+# The built frontend does not change while a production server runs, so it is
+# indexed once; debug mode rescans so rebuilt assets show up without a restart
+STATIC_FILES = scan_static_files()
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+    static_files = scan_static_files() if app.config['DEBUG'] else STATIC_FILES
+    if path in static_files:
+        return send_from_directory(STATIC_ROOT, path)
+    if 'index.html' in static_files:
+        return send_from_directory(STATIC_ROOT, 'index.html')
+    return "index.html not found", 404
 
 
 if __name__ == '__main__':
@@ -82,6 +148,23 @@ if __name__ == '__main__':
     host = os.getenv('FLASK_HOST', '0.0.0.0')
     debug = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
     
+    # Outside debug mode hand the process over to gunicorn. Scraping sessions
+    # are tracked in process memory, so a single worker serves everything and
+    # concurrency comes from its thread pool. Status long-polls hold a thread
+    # for up to MAX_STATUS_WAIT seconds, so the default is sized for waiting
+    # clients rather than CPU count.
+    if not debug:
+        threads = os.getenv('GUNICORN_THREADS', '32')
+        logger.info(f"Starting gunicorn on {host}:{port} with {threads} threads")
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        try:
+            os.execvp('gunicorn', [
+                'gunicorn', '-k', 'gthread', '-w', '1', '--threads', threads,
+                '-b', f'{host}:{port}', 'src.main:app'
+            ])
+        except FileNotFoundError:
+            logger.warning("gunicorn not installed, falling back to the Flask development server")
+    
     logger.info(f"Starting Flask server on {host}:{port} (debug={debug})")
     
     try:
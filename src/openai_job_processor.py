@@ -1,16 +1,45 @@
 import os
+import copy
 import json
 import logging
+import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
 import re
 
+import httpx
 from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Chat model used for extraction
+OPENAI_MODEL = "gpt-4o"
+
+# Batch API polling: batches complete within their 24h window, usually much sooner
+BATCH_POLL_INTERVAL = 30.0
+BATCH_TIMEOUT = 24 * 60 * 60
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# High-priority keywords that indicate core job information
+HIGH_PRIORITY_KEYWORDS = [
+    'responsibilities', 'requirements', 'qualifications', 'experience',
+    'salary', 'benefits', 'compensation', 'what you', 'we are looking',
+    'we offer', 'skills', 'must have', 'required', 'preferred'
+]
+
+# Medium-priority keywords for additional context
+MEDIUM_PRIORITY_KEYWORDS = [
+    'about', 'role', 'position', 'job', 'company', 'team', 'culture',
+    'remote', 'hybrid', 'location', 'apply', 'join', 'opportunity'
+]
+
+# Each keyword list fused into one case-insensitive pattern, so a line is
+# searched once per priority instead of once per keyword
+HIGH_PRIORITY_PATTERN = re.compile("|".join(map(re.escape, HIGH_PRIORITY_KEYWORDS)), re.IGNORECASE)
+MEDIUM_PRIORITY_PATTERN = re.compile("|".join(map(re.escape, MEDIUM_PRIORITY_KEYWORDS)), re.IGNORECASE)
+
+@dataclass(slots=True)
 class ProcessedJobData:
     """Structured job data extracted by AI from raw content"""
     # Core job information
@@ -83,6 +112,22 @@ class ProcessedJobData:
             self.openai_conversation = {}
         if self.processed_at is None:
             self.processed_at = datetime.utcnow()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Equivalent of dataclasses.asdict, reading fields straight from __slots__
+        instead of asdict's reflective, recursive walk. Lists are copied and
+        the nested conversation log is deep-copied.
+        """
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, list):
+                value = list(value)
+            elif isinstance(value, dict):
+                value = copy.deepcopy(value)
+            data[name] = value
+        return data
 
 class OpenAIJobProcessor:
     """
@@ -90,12 +135,13 @@ class OpenAIJobProcessor:
     Extracts structured job data from raw scraped content with high accuracy.
     """
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, http_client: Optional[httpx.Client] = None):
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        # http_client lets the caller share one connection pool across processors
+        self.client = OpenAI(api_key=self.api_key, http_client=http_client)
         
         # Enhanced system prompt for better confidence scoring
         self.system_prompt = """You are an expert job posting analyzer. Your task is to extract structured information from job posting content and return it as valid JSON.
@@ -165,63 +211,19 @@ Return this exact JSON structure:"""
         logger.info(f"Processing job content with OpenAI ({len(raw_markdown)} chars)")
         
         try:
-            # Prepare the content (truncate if too long to avoid token limits)
-            content = self._prepare_content(raw_markdown, url)
-            
-            # Create the extraction prompt
-            user_prompt = f"""Extract job posting information from this content:
-
-URL: {url}
-
-CONTENT:
-{content}
-
-Return the JSON structure with all available information. Be thorough in extraction and provide an accurate confidence score based on the completeness and clarity of the extracted information:"""
-
-            # Prepare messages for OpenAI
-            messages = [
-                {"role": "system", "content": self.system_prompt + "\n" + json.dumps(self.response_schema, indent=2)},
-                {"role": "user", "content": user_prompt}
-            ]
+            request_body = self._build_request_body(raw_markdown, url)
             
             # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # Use latest GPT-4 variant
-                messages=messages,
-                response_format={"type": "json_object"},  # Ensure JSON response
-                temperature=0.1,  # Low temperature for consistent extraction
-                max_tokens=2000  # Sufficient for structured response
-            )
-            
-            # Parse the response
-            extracted_data = json.loads(response.choices[0].message.content)
-            
-            # Save the full OpenAI conversation for transparency and debugging
-            conversation_log = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "model": "gpt-4o",
-                "messages": messages,
-                "response": response.choices[0].message.content,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens if response.usage else 0,
-                    "completion_tokens": response.usage.completion_tokens if response.usage else 0,
-                    "total_tokens": response.usage.total_tokens if response.usage else 0
-                },
-                "response_metadata": {
-                    "finish_reason": response.choices[0].finish_reason,
-                    "temperature": 0.1,
-                    "max_tokens": 2000
-                }
-            }
+            response = self.client.chat.completions.create(**request_body)
             
-            # Add conversation to extracted data
-            extracted_data["openai_conversation"] = conversation_log
-            
-            # Convert to our data structure
-            processed_data = self._convert_to_processed_data(extracted_data, raw_markdown)
-            
-            logger.info(f"Successfully extracted job data - AI confidence: {processed_data.ai_confidence:.2f}, Validation: {processed_data.validation_confidence:.2f}, Final: {processed_data.confidence_score:.2f}")
-            return processed_data
+            usage = response.usage.model_dump() if response.usage else None
+            return self._build_processed_data(
+                request_body["messages"],
+                response.choices[0].message.content,
+                response.choices[0].finish_reason,
+                usage,
+                raw_markdown
+            )
             
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing error: {e}")
@@ -231,6 +233,168 @@ Return the JSON structure with all available information. Be thorough in extract
             logger.error(f"OpenAI processing error: {e}")
             return self._create_fallback_data(raw_markdown, f"OpenAI API error: {e}")
     
+    def extract_job_data_batch(self, items: List[Tuple[str, str]], poll_interval: float = BATCH_POLL_INTERVAL,
+                               timeout: float = BATCH_TIMEOUT) -> List[ProcessedJobData]:
+        """
+        Extract structured job data for many (raw_markdown, url) pairs with one
+        OpenAI Batch job. Batches are billed at half price but complete
+        asynchronously within 24 hours, so this blocks until the batch finishes.
+        Results are returned in input order; items the batch did not complete
+        get fallback data.
+        """
+        if not items:
+            return []
+        
+        logger.info(f"Submitting OpenAI batch of {len(items)} extraction requests")
+        
+        batch = None
+        try:
+            requests_jsonl = []
+            messages_by_id = {}
+            for i, (raw_markdown, url) in enumerate(items):
+                custom_id = f"job-{i}"
+                request_body = self._build_request_body(raw_markdown, url)
+                messages_by_id[custom_id] = request_body["messages"]
+                requests_jsonl.append(json.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": request_body
+                }))
+            
+            input_file = self.client.files.create(
+                file=("job_extraction_batch.jsonl", "\n".join(requests_jsonl).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            
+            deadline = time.monotonic() + timeout
+            while batch.status not in BATCH_TERMINAL_STATUSES:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Batch {batch.id} still {batch.status} after {timeout:.0f}s")
+                time.sleep(poll_interval)
+                batch = self.client.batches.retrieve(batch.id)
+            
+            logger.info(f"OpenAI batch {batch.id} finished with status {batch.status}")
+            
+            outputs = {}
+            if batch.output_file_id:
+                for line in self.client.files.content(batch.output_file_id).text.splitlines():
+                    if line.strip():
+                        output = json.loads(line)
+                        outputs[output["custom_id"]] = output
+        
+        except Exception as e:
+            logger.error(f"OpenAI batch processing error: {e}")
+            if batch is not None and batch.status not in BATCH_TERMINAL_STATUSES:
+                self._cancel_batch(batch.id)
+            return [self._create_fallback_data(raw_markdown, f"OpenAI batch error: {e}") for raw_markdown, _ in items]
+        
+        results = []
+        for i, (raw_markdown, url) in enumerate(items):
+            custom_id = f"job-{i}"
+            output = outputs.get(custom_id)
+            response = (output or {}).get("response") or {}
+            if response.get("status_code") != 200:
+                error = (output or {}).get("error") or f"batch {batch.status} without a result"
+                results.append(self._create_fallback_data(raw_markdown, f"OpenAI batch error: {error}"))
+                continue
+            
+            try:
+                body = response["body"]
+                choice = body["choices"][0]
+                results.append(self._build_processed_data(
+                    messages_by_id[custom_id],
+                    choice["message"]["content"],
+                    choice.get("finish_reason"),
+                    body.get("usage"),
+                    raw_markdown
+                ))
+            except json.JSONDecodeError as e:
+                logger.error(f"JSON parsing error for {url}: {e}")
+                results.append(self._create_fallback_data(raw_markdown, f"JSON parsing failed: {e}"))
+            except (KeyError, IndexError, TypeError) as e:
+                logger.error(f"Malformed batch response for {url}: {e!r}")
+                results.append(self._create_fallback_data(raw_markdown, f"Malformed OpenAI batch response: {e!r}"))
+        
+        return results
+    
+    def _cancel_batch(self, batch_id: str):
+        """Cancel an abandoned batch so it is not left running (and billed) server-side"""
+        try:
+            self.client.batches.cancel(batch_id)
+            logger.info(f"Cancelled OpenAI batch {batch_id}")
+        except Exception as e:
+            logger.warning(f"Failed to cancel OpenAI batch {batch_id}: {e}")
+    
+    def _build_request_body(self, raw_markdown: str, url: str) -> Dict[str, Any]:
+        """Build the chat completion request for one job posting"""
+        # Prepare the content (truncate if too long to avoid token limits)
+        content = self._prepare_content(raw_markdown, url)
+        
+        # Create the extraction prompt
+        user_prompt = f"""Extract job posting information from this content:
+
+URL: {url}
+
+CONTENT:
+{content}
+
+Return the JSON structure with all available information. Be thorough in extraction and provide an accurate confidence score based on the completeness and clarity of the extracted information:"""
+
+        # Prepare messages for OpenAI
+        messages = [
+            {"role": "system", "content": self.system_prompt + "\n" + json.dumps(self.response_schema, indent=2)},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        return {
+            "model": OPENAI_MODEL,  # Use latest GPT-4 variant
+            "messages": messages,
+            "response_format": {"type": "json_object"},  # Ensure JSON response
+            "temperature": 0.1,  # Low temperature for consistent extraction
+            "max_tokens": 2000  # Sufficient for structured response
+        }
+    
+    def _build_processed_data(self, messages: List[Dict[str, str]], response_content: str,
+                              finish_reason: Optional[str], usage: Optional[Dict[str, Any]],
+                              raw_markdown: str) -> ProcessedJobData:
+        """Parse a chat completion's JSON content into ProcessedJobData, keeping the conversation log"""
+        # Parse the response
+        extracted_data = json.loads(response_content)
+        
+        usage = usage or {}
+        # Save the full OpenAI conversation for transparency and debugging
+        conversation_log = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "model": OPENAI_MODEL,
+            "messages": messages,
+            "response": response_content,
+            "usage": {
+                "prompt_tokens": usage.get("prompt_tokens", 0),
+                "completion_tokens": usage.get("completion_tokens", 0),
+                "total_tokens": usage.get("total_tokens", 0)
+            },
+            "response_metadata": {
+                "finish_reason": finish_reason,
+                "temperature": 0.1,
+                "max_tokens": 2000
+            }
+        }
+        
+        # Add conversation to extracted data
+        extracted_data["openai_conversation"] = conversation_log
+        
+        # Convert to our data structure
+        processed_data = self._convert_to_processed_data(extracted_data, raw_markdown)
+        
+        logger.info(f"Successfully extracted job data - AI confidence: {processed_data.ai_confidence:.2f}, Validation: {processed_data.validation_confidence:.2f}, Final: {processed_data.confidence_score:.2f}")
+        return processed_data
+    
     def _prepare_content(self, raw_markdown: str, url: str) -> str:
         """Prepare content for OpenAI processing with improved prioritization"""
         # Limit content to avoid token limits (roughly 8000 tokens = 32000 characters)
@@ -240,43 +404,33 @@ Return the JSON structure with all available information. Be thorough in extract
             # Enhanced priority keywords for better content preservation
             lines = raw_markdown.split('\n')
             important_content = []
+            # Mirrors important_content for O(1) "already kept" checks
+            kept = set()
             current_length = 0
             
-            # High-priority keywords that indicate core job information
-            high_priority_keywords = [
-                'responsibilities', 'requirements', 'qualifications', 'experience',
-                'salary', 'benefits', 'compensation', 'what you', 'we are looking',
-                'we offer', 'skills', 'must have', 'required', 'preferred'
-            ]
-            
-            # Medium-priority keywords for additional context
-            medium_priority_keywords = [
-                'about', 'role', 'position', 'job', 'company', 'team', 'culture',
-                'remote', 'hybrid', 'location', 'apply', 'join', 'opportunity'
-            ]
-            
             # First pass: add high-priority lines
             for line in lines:
-                line_lower = line.lower()
-                if any(keyword in line_lower for keyword in high_priority_keywords):
+                if HIGH_PRIORITY_PATTERN.search(line):
                     if current_length + len(line) < max_content_length * 0.7:  # Reserve 30% for other content
                         important_content.append(line)
+                        kept.add(line)
                         current_length += len(line)
             
             # Second pass: add medium-priority lines
             for line in lines:
-                if line not in important_content:
-                    line_lower = line.lower()
-                    if any(keyword in line_lower for keyword in medium_priority_keywords):
+                if line not in kept:
+                    if MEDIUM_PRIORITY_PATTERN.search(line):
                         if current_length + len(line) < max_content_length * 0.9:  # Reserve 10% for any remaining content
                             important_content.append(line)
+                            kept.add(line)
                             current_length += len(line)
             
             # Third pass: fill remaining space with other content
             for line in lines:
-                if line not in important_content:
+                if line not in kept:
                     if current_length + len(line) < max_content_length:
                         important_content.append(line)
+                        kept.add(line)
                         current_length += len(line)
                     else:
                         break
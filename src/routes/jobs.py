@@ -4,7 +4,8 @@ import os
 import logging
 from typing import List, Dict, Any
 import threading
-import time
+import atexit
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import sys
 import os
@@ -15,8 +16,8 @@ if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
 from job_scraper import JobScraper
-from supabase_integration import supabase_scraper
-from integrated_flexible_scraper import IntegratedFlexibleScraper
+from scrape_cache import SCRAPE_CACHE_TTL
+from supabase_integration import supabase_scraper, ScrapeLogBuffer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,6 +29,16 @@ jobs_bp = Blueprint('jobs', __name__)
 FIRECRAWL_API_KEY = os.getenv('FIRECRAWL_API_KEY', '')
 SUPABASE_URL = os.getenv('SUPABASE_URL', '')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY', '')
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
+EXTRACTION_CACHE_DIR = os.getenv('EXTRACTION_CACHE_DIR') or None
+# Record per-job progress rows in scrape_logs, not just failures
+DETAILED_SCRAPE_LOGS = os.getenv('DETAILED_SCRAPE_LOGS', 'True').lower() == 'true'
+# Concurrent URL scrapes per /scrape session
+SCRAPER_WORKERS = int(os.getenv('SCRAPER_WORKERS', 8))
+# Background scraping sessions that may run at the same time
+BATCH_POOL_SIZE = int(os.getenv('BATCH_POOL_SIZE', 4))
+# Completed URLs between scrape_sessions progress writes
+PROGRESS_UPDATE_EVERY = int(os.getenv('PROGRESS_UPDATE_EVERY', 10))
 
 # Log the loaded configuration
 if FIRECRAWL_API_KEY:
@@ -41,15 +52,46 @@ else:
     logger.warning("Supabase credentials not found. Database functionality will be limited.")
 
 # Initialize services
-scraper = JobScraper(FIRECRAWL_API_KEY)
-flexible_scraper = IntegratedFlexibleScraper(FIRECRAWL_API_KEY, supabase_scraper)
+scraper = JobScraper(FIRECRAWL_API_KEY, cache_ttl=float(os.getenv('SCRAPE_CACHE_TTL', SCRAPE_CACHE_TTL)))
+
+# The flexible pipeline pulls in the Firecrawl and OpenAI SDKs, so they are
+# only imported when both keys are configured
+if FIRECRAWL_API_KEY and OPENAI_API_KEY:
+    from integrated_flexible_scraper import IntegratedFlexibleScraper
+    flexible_scraper = IntegratedFlexibleScraper(FIRECRAWL_API_KEY, supabase_scraper, cache_dir=EXTRACTION_CACHE_DIR,
+                                                 detailed_logging=DETAILED_SCRAPE_LOGS)
+else:
+    logger.warning("AI-powered flexible scraping disabled: FIRECRAWL_API_KEY and OPENAI_API_KEY are both required.")
+    flexible_scraper = None
+
+# Shared pool for background scraping sessions; sessions beyond
+# BATCH_POOL_SIZE queue until a worker frees up
+session_executor = ThreadPoolExecutor(max_workers=BATCH_POOL_SIZE, thread_name_prefix='scrape-session')
+atexit.register(session_executor.shutdown, wait=False)
 
 # Global variable to track scraping sessions
 scraping_sessions = {}
 
+# Wakes long-polling status requests whenever a local session changes
+sessions_changed = threading.Condition()
+
+# Upper bound (seconds) a status request may be held open with ?wait=
+MAX_STATUS_WAIT = 30
+
+def touch_session(session_id: str, **updates):
+    """Apply updates to a local session, bump its sequence number and wake long-pollers"""
+    with sessions_changed:
+        session = scraping_sessions.setdefault(session_id, {})
+        session.update(updates)
+        session['seq'] = session.get('seq', 0) + 1
+        sessions_changed.notify_all()
+
 @jobs_bp.route('/scrape/flexible', methods=['POST'])
 def scrape_jobs_flexible():
     """Endpoint to scrape job postings using AI-powered flexible scraper"""
+    if flexible_scraper is None:
+        return jsonify({'error': 'AI-powered scraping is not configured'}), 503
+    
     try:
         data = request.get_json()
         urls = data.get('urls', [])
@@ -74,28 +116,35 @@ def scrape_jobs_flexible():
                 # Update session status to running
                 supabase_scraper.update_session_status(session_id, 'running')
                 
-                scraping_sessions[session_id] = {
-                    'status': 'running',
-                    'total_urls': len(urls),
-                    'completed': 0,
-                    'results': [],
-                    'errors': []
-                }
+                touch_session(
+                    session_id,
+                    status='running',
+                    total_urls=len(urls),
+                    completed=0,
+                    results=[],
+                    errors=[]
+                )
                 
                 # Use the integrated flexible scraper
-                results = flexible_scraper.scrape_multiple_jobs_flexible(urls, session_id)
+                results = flexible_scraper.scrape_multiple_jobs_flexible(
+                    urls,
+                    session_id,
+                    progress_callback=lambda completed: touch_session(session_id, completed=completed)
+                )
                 
                 # Process results
                 successful_results = []
+                total_confidence = 0
                 for i, result in enumerate(results):
                     if result['success']:
                         successful_results.append(result)
+                        total_confidence += result.get('confidence_score', 0)
                         scraping_sessions[session_id]['results'].append(result)
                     else:
                         error_msg = f"Error scraping {urls[i]}: {result.get('error', 'Unknown error')}"
                         scraping_sessions[session_id]['errors'].append(error_msg)
-                    
-                    scraping_sessions[session_id]['completed'] = i + 1
+                
+                touch_session(session_id, completed=len(results))
                 
                 # Update final session status
                 supabase_scraper.update_session_status(
@@ -106,24 +155,26 @@ def scrape_jobs_flexible():
                         'total_scraped': len(successful_results), 
                         'total_errors': len(scraping_sessions[session_id]['errors']),
                         'method': 'flexible_ai',
-                        'avg_confidence': sum(r.get('confidence_score', 0) for r in successful_results) / max(len(successful_results), 1)
+                        'avg_confidence': total_confidence / max(len(successful_results), 1)
                     }
                 )
                 supabase_scraper.update_session_progress(session_id, len(urls))
                 
-                scraping_sessions[session_id]['status'] = 'completed'
+                touch_session(session_id, status='completed')
                 logger.info(f"Flexible scraping session {session_id} completed: {len(successful_results)}/{len(urls)} successful")
                 
             except Exception as e:
                 supabase_scraper.update_session_status(session_id, 'failed', errors=[str(e)])
-                scraping_sessions[session_id]['status'] = 'failed'
-                scraping_sessions[session_id]['errors'].append(str(e))
+                scraping_sessions.setdefault(session_id, {}).setdefault('errors', []).append(str(e))
+                touch_session(session_id, status='failed')
                 logger.error(f"Flexible scraping session {session_id} failed: {e}")
         
-        # Start background thread
-        thread = threading.Thread(target=scrape_background_flexible)
-        thread.daemon = True
-        thread.start()
+        # Register the session before it is queued so status long-polls wait
+        # on it while all BATCH_POOL_SIZE workers are busy
+        touch_session(session_id, status='pending', total_urls=len(urls), completed=0, results=[], errors=[])
+        
+        # Hand the session to the shared background pool
+        session_executor.submit(scrape_background_flexible)
         
         return jsonify({
             'session_id': session_id,
@@ -159,44 +210,64 @@ def scrape_jobs():
         
         # Start scraping in background thread
         def scrape_background():
+            # Session log lines are written in batches by the buffer's writer thread
+            log_buffer = ScrapeLogBuffer(supabase_scraper)
             try:
                 # Update session status to running
                 supabase_scraper.update_session_status(session_id, 'running')
                 
-                scraping_sessions[session_id] = {
-                    'status': 'running',
-                    'total_urls': len(urls),
-                    'completed': 0,
-                    'results': [],
-                    'errors': []
-                }
+                touch_session(
+                    session_id,
+                    status='running',
+                    total_urls=len(urls),
+                    completed=0,
+                    results=[],
+                    errors=[]
+                )
                 
                 results = []
-                for i, url in enumerate(urls):
-                    try:
-                        logger.info(f"Scraping job {i+1}/{len(urls)}: {url}")
-                        supabase_scraper.update_session_progress(session_id, i, url)
-                        supabase_scraper.log_scrape_info(session_id, url, f"Starting scrape {i+1}/{len(urls)}")
-                        
-                        result = scraper.scrape_job(url)
+                completed = 0
+                
+                def scrape_one(i: int, url: str):
+                    logger.info(f"Scraping job {i+1}/{len(urls)}: {url}")
+                    if DETAILED_SCRAPE_LOGS:
+                        log_buffer.info(session_id, url, f"Starting scrape {i+1}/{len(urls)}")
+                    
+                    result = scraper.scrape_job(url)
+                    
+                    if result:
+                        # Store in Supabase
+                        job_id = supabase_scraper.save_job_posting(result, session_id)
+                        if job_id:
+                            result['stored_job_id'] = job_id
+                            if DETAILED_SCRAPE_LOGS:
+                                log_buffer.info(session_id, url, f"Successfully saved job posting: {job_id}")
+                    return result
+                
+                # Each URL is network-bound (Firecrawl + Supabase), so scrape several at once
+                with ThreadPoolExecutor(max_workers=SCRAPER_WORKERS) as executor:
+                    futures = {executor.submit(scrape_one, i, url): url for i, url in enumerate(urls)}
+                    for future in as_completed(futures):
+                        url = futures[future]
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            error_msg = f"Error scraping {url}: {str(e)}"
+                            logger.error(error_msg)
+                            scraping_sessions[session_id]['errors'].append(error_msg)
+                            log_buffer.error(session_id, url, error_msg, {'exception': str(e)})
+                            result = None
                         
+                        # Results are collected on this thread only, so no locking is needed
                         if result:
                             results.append(result)
-                            
-                            # Store in Supabase
-                            job_id = supabase_scraper.save_job_posting(result, session_id)
-                            if job_id:
-                                result['stored_job_id'] = job_id
-                                supabase_scraper.log_scrape_info(session_id, url, f"Successfully saved job posting: {job_id}")
-                        
-                        scraping_sessions[session_id]['completed'] = i + 1
-                        scraping_sessions[session_id]['results'] = results
-                        
-                    except Exception as e:
-                        error_msg = f"Error scraping {url}: {str(e)}"
-                        logger.error(error_msg)
-                        scraping_sessions[session_id]['errors'].append(error_msg)
-                        supabase_scraper.log_scrape_error(session_id, url, error_msg, {'exception': str(e)})
+                        completed += 1
+                        touch_session(session_id, completed=completed, results=results)
+                        # Progress is counted here rather than in the workers so it only moves forward
+                        if completed % PROGRESS_UPDATE_EVERY == 0:
+                            supabase_scraper.update_session_progress(session_id, completed, url)
+                
+                log_buffer.flush()
                 
                 # Update final session status
                 supabase_scraper.update_session_status(
@@ -207,19 +278,23 @@ def scrape_jobs():
                 )
                 supabase_scraper.update_session_progress(session_id, len(urls))
                 
-                scraping_sessions[session_id]['status'] = 'completed'
+                touch_session(session_id, status='completed')
                 logger.info(f"Scraping session {session_id} completed")
                 
             except Exception as e:
                 supabase_scraper.update_session_status(session_id, 'failed', errors=[str(e)])
-                scraping_sessions[session_id]['status'] = 'failed'
-                scraping_sessions[session_id]['errors'].append(str(e))
+                scraping_sessions.setdefault(session_id, {}).setdefault('errors', []).append(str(e))
+                touch_session(session_id, status='failed')
                 logger.error(f"Scraping session {session_id} failed: {e}")
+            finally:
+                log_buffer.close()
+        
+        # Register the session before it is queued so status long-polls wait
+        # on it while all BATCH_POOL_SIZE workers are busy
+        touch_session(session_id, status='pending', total_urls=len(urls), completed=0, results=[], errors=[])
         
-        # Start background thread
-        thread = threading.Thread(target=scrape_background)
-        thread.daemon = True
-        thread.start()
+        # Hand the session to the shared background pool
+        session_executor.submit(scrape_background)
         
         return jsonify({
             'session_id': session_id,
@@ -233,8 +308,29 @@ def scrape_jobs():
 
 @jobs_bp.route('/scrape/status/<session_id>', methods=['GET'])
 def get_scraping_status(session_id):
-    """Get the status of a scraping session"""
+    """
+    Get the status of a scraping session.
+    
+    Supports long-polling: pass ?since=<seq>&wait=<seconds> to hold the request
+    until the local session changes (up to MAX_STATUS_WAIT seconds). Returns 304
+    if nothing changed within the wait window.
+    
+    Responses carry an ETag; a request whose If-None-Match matches the current
+    status gets an empty 304 instead of the JSON body.
+    """
     try:
+        wait = min(request.args.get('wait', 0, type=float), MAX_STATUS_WAIT)
+        since = request.args.get('since', type=int)
+        
+        if wait > 0 and since is not None and session_id in scraping_sessions:
+            with sessions_changed:
+                changed = sessions_changed.wait_for(
+                    lambda: scraping_sessions[session_id].get('seq', 0) != since,
+                    timeout=wait
+                )
+            if not changed:
+                return '', 304
+        
         # Get from Supabase first
         session_data = supabase_scraper.get_session(session_id)
         if not session_data:
@@ -243,8 +339,9 @@ def get_scraping_status(session_id):
         # Get local session data for additional info
         local_session = scraping_sessions.get(session_id, {})
         
-        return jsonify({
+        response = jsonify({
             'session_id': session_id,
+            'seq': local_session.get('seq', 0),
             'status': session_data['status'],
             'total_urls': session_data['total_urls'],
             'completed_urls': session_data.get('completed_urls', 0),
@@ -258,6 +355,8 @@ def get_scraping_status(session_id):
             'error_count': len(local_session.get('errors', [])),
             'errors': local_session.get('errors', [])
         })
+        response.add_etag()
+        return response.make_conditional(request)
         
     except Exception as e:
         logger.error(f"Error getting scraping status: {e}")
@@ -436,6 +535,7 @@ def get_config():
     
     return jsonify({
         'firecrawl_configured': bool(FIRECRAWL_API_KEY),
+        'openai_configured': bool(OPENAI_API_KEY),
         'supabase_configured': bool(SUPABASE_URL and SUPABASE_KEY),
         'supabase_connected': supabase_connected
     })
@@ -0,0 +1,44 @@
+"""
+In-memory cache of scrape results shared by the Firecrawl scrapers
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Scrape results kept in memory, and for how long (seconds)
+SCRAPE_CACHE_SIZE = 1000
+SCRAPE_CACHE_TTL = 3600
+
+class ScrapeCache:
+    """Thread-safe LRU cache of scrape results whose entries expire after ttl seconds"""
+    
+    def __init__(self, maxsize: int = SCRAPE_CACHE_SIZE, ttl: float = SCRAPE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get(self, key) -> Optional[Any]:
+        """Return a copy of the cached entry, or None if missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+        return copy.deepcopy(value)
+    
+    def put(self, key, value: Any):
+        """Store a copy of value, evicting the least recently used entry when full"""
+        value = copy.deepcopy(value)
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
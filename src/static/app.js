@@ -178,13 +178,44 @@ class JobScraperApp {
     async monitorScrapingProgress() {
         if (!this.currentSession) return;
 
+        let lastSeq = null;
+        let lastEtag = null;
+
         const checkProgress = async () => {
             try {
-                const status = await this.apiCall(`/scrape/status/${this.currentSession}`);
+                let endpoint = `/scrape/status/${this.currentSession}`;
+                if (lastSeq !== null) {
+                    // Long-poll: the server holds the request until the session changes
+                    endpoint += `?since=${lastSeq}&wait=30`;
+                }
+
+                // Send the last ETag so an unchanged status comes back as an empty 304
+                const headers = lastEtag ? { 'If-None-Match': lastEtag } : {};
+                const response = await fetch(`${this.apiBase}${endpoint}`, { headers });
+                if (response.status === 304) {
+                    if (lastSeq !== null) {
+                        checkProgress(); // Nothing changed within the wait window, reconnect
+                    } else {
+                        setTimeout(checkProgress, 2000); // Status unchanged since the last poll
+                    }
+                    return;
+                }
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+
+                lastEtag = response.headers.get('ETag');
+                const status = await response.json();
                 this.updateProgress(status);
 
-                if (status.status === 'running') {
-                    setTimeout(checkProgress, 2000); // Check every 2 seconds
+                // Pending sessions are queued behind other sessions and have not started yet
+                if (status.status === 'running' || status.status === 'pending') {
+                    if (status.seq) {
+                        lastSeq = status.seq;
+                        checkProgress();
+                    } else {
+                        setTimeout(checkProgress, 2000); // Server lacks long-poll support, check every 2 seconds
+                    }
                 } else {
                     this.hideProgressSection();
                     if (status.status === 'completed') {
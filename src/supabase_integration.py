@@ -7,6 +7,10 @@ Handles storing scraped job data into Supabase database
 import os
 import json
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 import uuid
@@ -26,6 +30,11 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# scrape_logs rows buffered before a ScrapeLogBuffer writes them in one insert
+LOG_FLUSH_BATCH = 500
+# Rows a ScrapeLogBuffer holds before producers block on its writer
+LOG_QUEUE_SIZE = 10000
+
 class SupabaseJobScraper:
     """Enhanced Supabase integration for job scraper with existing platform integration"""
     
@@ -209,6 +218,18 @@ class SupabaseJobScraper:
         except Exception as e:
             self.logger.error(f"Failed to log info: {e}")
     
+    def log_scrape_entries(self, entries: List[Dict[str, Any]]) -> bool:
+        """Insert several scrape log rows in one request; columns missing from a row keep their defaults"""
+        if not entries:
+            return True
+        try:
+            self.client.table('scrape_logs').insert(entries, default_to_null=False).execute()
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to write {len(entries)} scrape logs: {e}")
+            return False
+    
     # Session Queries
     def get_session(self, session_id: str) -> Optional[Dict]:
         """Get session details"""
@@ -290,6 +311,82 @@ class SupabaseJobScraper:
             self.logger.error(f"Failed to merge job posting: {e}")
             return None
 
+class ScrapeLogBuffer:
+    """
+    Thread-safe buffer of scrape_logs rows. Producers only enqueue rows; a single
+    writer thread batches them into one multi-row insert once flush_every
+    accumulate, or when flush() is called, so scraping threads never wait on the
+    database. The queue is bounded, so producers block rather than grow memory
+    without limit if Supabase falls behind.
+    """
+    
+    def __init__(self, scraper: SupabaseJobScraper, flush_every: int = LOG_FLUSH_BATCH,
+                 max_queued: int = LOG_QUEUE_SIZE):
+        self.scraper = scraper
+        self.flush_every = flush_every
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.writer = threading.Thread(target=self._run, name='scrape-log-writer', daemon=True)
+        self.writer.start()
+    
+    def add(self, session_id: str, url: str, level: str, message: str, error_details: Dict = None):
+        """Queue a log row, stamped with the current time"""
+        # Keep the raw clock reading; it is formatted only when the batch is written
+        entry = {
+            'session_id': session_id,
+            'url': url,
+            'log_level': level,
+            'message': message,
+            'created_at': time.time_ns()
+        }
+        if error_details is not None:
+            entry['error_details'] = error_details
+        self.queue.put(entry)
+    
+    def info(self, session_id: str, url: str, message: str):
+        self.add(session_id, url, 'info', message)
+    
+    def error(self, session_id: str, url: str, message: str, error_details: Dict = None):
+        self.add(session_id, url, 'error', message, error_details or {})
+    
+    def flush(self) -> bool:
+        """Write every row queued so far and wait for the insert to finish"""
+        if not self.writer.is_alive():
+            return False
+        done = Future()
+        self.queue.put(done)
+        return done.result()
+    
+    def close(self):
+        """Write any remaining rows and stop the writer thread"""
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+    
+    def _run(self):
+        """Writer thread: batch queued rows until a flush request or the stop sentinel"""
+        batch = []
+        while True:
+            item = self.queue.get()
+            if item is None or isinstance(item, Future):
+                written = self._write(batch)
+                batch = []
+                if item is None:
+                    return
+                item.set_result(written)
+            else:
+                batch.append(item)
+                if len(batch) >= self.flush_every:
+                    self._write(batch)
+                    batch = []
+    
+    def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        """Format the batch's timestamps and insert it"""
+        if not batch:
+            return True
+        for entry in batch:
+            entry['created_at'] = datetime.fromtimestamp(entry['created_at'] / 1e9, tz=timezone.utc).isoformat()
+        return self.scraper.log_scrape_entries(batch)
+
 # Global instance
 supabase_scraper = SupabaseJobScraper()
 